@@ -15,19 +15,22 @@ FILE_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(FILE_DIR, os.pardir, os.pardir))
 sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
 from tripMD import load, main
+from tripMD.objects.trip_store import save_trip_store
 from utils import uah_data
 
 DEFAULT_DATA_PATH = os.path.abspath(os.path.join(ROOT_DIR, os.pardir, "data-uah"))
 DEFAULT_DRIVER_PATH = os.path.abspath(os.path.join(ROOT_DIR, os.pardir, "data-uah/D2"))
 
 
-def run_all_drivers(data_path=DEFAULT_DATA_PATH, freq_per_second=5):
+def run_all_drivers(
+    data_path=DEFAULT_DATA_PATH, freq_per_second=5, n_jobs=1, use_cache=True
+):
     output_folder = os.path.join(ROOT_DIR, "outputs/all_drivers")
     Path(output_folder).mkdir(parents=True, exist_ok=True)
     # Load data
     abs_data_path = os.path.abspath(data_path)
     print("-- Running TripMD eval for all drivers :")
-    data_df = uah_data.get_full_point_uah_data(abs_data_path, freq_per_second)
+    data_df = load_uah_data(abs_data_path, freq_per_second, n_jobs, use_cache)
     # Filtering two trips with data errors!
     clean_data_df = data_df[
         ~data_df["trip_id"].isin(["20151126134736", "20151211160213"])
@@ -36,14 +39,18 @@ def run_all_drivers(data_path=DEFAULT_DATA_PATH, freq_per_second=5):
 
 
 def run_driver(
-    driver_data_path=DEFAULT_DRIVER_PATH, freq_per_second=5, output_name="D2_driver"
+    driver_data_path=DEFAULT_DRIVER_PATH,
+    freq_per_second=5,
+    output_name="D2_driver",
+    n_jobs=1,
+    use_cache=True,
 ):
     output_folder = os.path.join(ROOT_DIR, "outputs", output_name)
     Path(output_folder).mkdir(parents=True, exist_ok=True)
     # Load data
     abs_data_path = os.path.abspath(driver_data_path)
     print("-- Running TripMD eval for {} :".format(abs_data_path))
-    data_df = uah_data.get_full_point_uah_data(abs_data_path, freq_per_second)
+    data_df = load_uah_data(abs_data_path, freq_per_second, n_jobs, use_cache)
     # Filtering two trips with data errors!
     clean_data_df = data_df[
         ~data_df["trip_id"].isin(["20151126134736", "20151211160213"])
@@ -51,6 +58,17 @@ def run_driver(
     run_tripmd_pipeline(clean_data_df, output_folder, freq_per_second)
 
 
+def load_uah_data(data_path, freq_per_second, n_jobs, use_cache):
+    if use_cache:
+        return uah_data.get_cached_full_point_uah_data(
+            data_path, freq_per_second, n_jobs=n_jobs
+        )
+    else:
+        return uah_data.get_full_point_uah_data(
+            data_path, freq_per_second, n_jobs=n_jobs
+        )
+
+
 def run_tripmd_pipeline(data_df, output_folder, freq_per_second):
     start_time = time.time()
     # Create trip list
@@ -58,18 +76,22 @@ def run_tripmd_pipeline(data_df, output_folder, freq_per_second):
     excluded_fields = {"ax", "event_level", "event", "user_id", "road"}
     label_fields = ["lc_event", "event_type", "trip_label"]
     timestamp_field = "timestamp"
-    trip_list = load.load_trips_from_dataframe(
+    trip_generator = load.iter_trips_from_dataframe(
         data_df,
         trip_id_field,
         excluded_fields=excluded_fields,
         timestamp_field=timestamp_field,
         label_fields=label_fields,
     )
+    store_folder = os.path.join(output_folder, "trip_store")
+    trip_store = save_trip_store(trip_generator, store_folder)
+    # a pickled store only holds the path of its folder, so the file keeps the trips themselves and the outputs can be
+    # moved and read without the store
     save_file = os.path.join(output_folder, "trip_list.p")
-    pickle.dump(trip_list, open(save_file, "wb"))
-    print("Data was loaded and trip_list was created")
+    pickle.dump([trip.to_trip() for trip in trip_store], open(save_file, "wb"))
+    print("Data was loaded and the trip store was created")
     # Init tripMD
-    trip_md = main.TripMD(trip_list, freq_per_second, estimate_max_radius=True)
+    trip_md = main.TripMD(trip_store, freq_per_second, estimate_max_radius=True)
     print(
         "Running TripMD with a max radius of {}".format(round(trip_md._max_radius, 4))
     )
@@ -14,7 +14,7 @@ LON_LETTER_DICT = {
 
 
 def describe_trip_motif(motif, lat_index, lon_index):
-    pattern_tuple = motif.get_pattern()
+    pattern_tuple = motif.get_str_pattern()
     lat_word = pattern_tuple[lat_index]
     lon_word = pattern_tuple[lon_index]
     maneuvers_dict = _describe_from_sax_words(lat_word, lon_word)
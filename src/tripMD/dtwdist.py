@@ -1,25 +1,50 @@
+import os
+import shutil
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 from dtaidistance import dtw_ndim
 import numpy as np
 
+# relative margin of the lower bounds' pruning, so that rounding errors never prune a pair that is within the radius
+LB_TOLERANCE = 1e-9
+# maximum number of rows (and columns) of each tile of the pairwise comparison
+DEFAULT_TILE_SIZE = 256
+# bytes of the float64 work arrays of the lower bounds, per observation and dimension of each compared pair
+LB_BYTES_PER_OBS = 24
+# multiple of max_dist at which the distances to the pivots are abandoned and capped (see `DTWPivotIndex`)
+PIVOT_DIST_FACTOR = 4
+# number of sampled candidates to medoid that are refined with their exact neighbors
+MEDOID_N_CONTENDERS = 5
+# probability that a confidence interval of the sampled neighbor fractions fails (see `DTWMedoidSampler`)
+MEDOID_DELTA = 0.05
+# width of the confidence intervals of the sampled neighbor fractions below which the sampling stops
+MEDOID_TOLERANCE = 0.05
+# top fraction of all the candidates (by number of neighbors) that the confidence of the sampled medoid refers to
+MEDOID_QUANTILE = 0.05
 
-def compute_ndim_dtw_dist_mat(ts_list, max_dist=None):
+
+def compute_ndim_dtw_dist_mat(ts_list, max_dist=None, parallel=True):
     """
     This function computes the pairwise distance matrix of a list of multidimensional time-series with Dynamic Time
     Warping distance. It is based on dtaidistance package
 
-    :param ts_list: list of multidimensional time-series to compare pairwise. This is a list is lists, where each list
-    correspond to a time-series and includes 1-D numpy arrays. Each numpy array is a single multidimensional observation
-    of that time-series. Thus, the size of the numpy arrays must be all the same for all the trips and they encode the
-    feature dimensions.
-    :type ts_list: list of lists of 1D array
+    :param ts_list: list of multidimensional time-series to compare pairwise. Each time-series is a 2D numpy array of
+    shape (length, n_dim) (e.g., a window view taken with `Trip.get_window_view`), where each row is a single
+    multidimensional observation of that time-series. Thus, the number of columns must be the same for all the
+    time-series and they encode the feature dimensions.
+    :type ts_list: list of 2D array
     :param max_dist: distance upper bound - if distance is higher than max_dist, then computation stops and the distance
      is set as inf this parameter serves merely for speeding up computation
     :type max_dist: float
+    :param parallel: whether the distances are computed in parallel (with a pool of processes). It should be False when
+    this function is already called from a worker process
+    :type parallel: bool
     :return: distance matrix
     :rtype: 2D array
     """
     dist_matrix_vec = dtw_ndim.distance_matrix(
-        ts_list, parallel=True, max_dist=max_dist
+        ts_list, parallel=parallel, max_dist=max_dist
     )
     dist_matrix = np.triu(dist_matrix_vec) + np.triu(dist_matrix_vec).T
     np.fill_diagonal(dist_matrix, 0)
@@ -32,3 +57,691 @@ def compute_ndim_dwt_dist_between_ts_and_list(single_ts, ts_list, max_dist=None)
         dist = dtw_ndim.distance(single_ts, ts, max_dist=max_dist)
         dist_list.append(dist)
     return dist_list
+
+
+def compute_ndim_dtw_neighbors(
+    ts_list, max_dist, parallel=True, max_memory=None, n_threads=1, spill_folder=None
+):
+    """
+    This function finds, for each multidimensional time-series of a list, the time-series whose Dynamic Time Warping
+    distance to it is lower than max_dist. The distances are the same as in `compute_ndim_dtw_dist_mat`, but the pairs
+    are first filtered with two lower bounds of the DTW distance and the exact distance is only computed for the pairs
+    that may be within max_dist:
+        - LB_Kim: any warping path matches the first observations and the last observations of both time-series.
+        - LB_Keogh: each observation of a time-series is matched to some observation of the other, which is inside the
+        other's envelope (i.e. its minimum and maximum in each dimension). The bound is computed in both directions.
+    The result is a sparse structure (in the CSR format) with only the pairs within max_dist, so neither the time nor
+    the memory grow with the pairs that are far apart.
+
+    The upper triangle of the pairwise comparison is split in square tiles, which are processed independently (by a
+    pool of n_threads threads) and only keep their pairs within max_dist. When max_memory is set, it first pays for the
+    copy of the time-series padded to the same length that the lower bounds use, and the rest is split in half: the
+    tiles and the chunks of pairs whose lower bounds are computed at once are sized to fit one half, and the neighbors
+    that do not fit the other half are written to memory-mapped files in spill_folder, so the full distance matrix
+    never exists in memory.
+
+    :param ts_list: list of multidimensional time-series to compare pairwise. Each time-series is a 2D numpy array of
+    shape (length, n_dim).
+    :type ts_list: list of 2D array
+    :param max_dist: only the pairs of time-series with a distance lower than max_dist are kept
+    :type max_dist: float
+    :param parallel: whether the exact distances are computed in parallel (with a pool of processes). It should be
+    False when this function is already called from a worker process
+    :type parallel: bool
+    :param max_memory: approximate ceiling, in bytes, of the memory used by the padded copy of the time-series, the
+    work arrays of the tiles and the neighbors kept in memory. It defaults to None, in which case there is no ceiling
+    :type max_memory: int
+    :param n_threads: number of threads that process the tiles. The exact distances are computed in pure python, which
+    holds the GIL, so several threads only help when parallel is True and a single thread is used otherwise
+    :type n_threads: int
+    :param spill_folder: folder where the neighbors that do not fit in max_memory are written. It defaults to None, in
+    which case the system's temporary folder is used
+    :type spill_folder: str
+    :return: tuple (indptr, indices, dists), where the neighbors of the i-th time-series are indices[indptr[i]:indptr[i +
+    1]], in increasing order, and dists[indptr[i]:indptr[i + 1]] are their distances to it. Each time-series is a
+    neighbor of itself, with distance 0. indices and dists are memory-mapped arrays if they do not fit in max_memory
+    :rtype: tuple of 1D array
+    """
+    if max_dist is None:
+        max_dist = np.inf
+    n_ts = len(ts_list)
+    pool = mp.Pool() if (parallel and n_ts > 1) else None
+    if pool is None:
+        # without the pool, the exact distances hold the GIL, so more threads would only compete for it
+        n_threads = 1
+    series_summary = _SeriesSummary(ts_list)
+    work_memory, neighbor_memory = _split_memory(series_summary, max_memory)
+    tile_size, chunk_size = _get_tile_and_chunk_sizes(
+        series_summary, work_memory, n_threads
+    )
+    tile_list = [
+        (row_start, col_start)
+        for row_start in range(0, n_ts, tile_size)
+        for col_start in range(row_start, n_ts, tile_size)
+    ]
+    neighbor_store = _NeighborStore(n_ts, tile_size, neighbor_memory, spill_folder)
+    try:
+        tile_args_list = [
+            (tile, series_summary, max_dist, tile_size, chunk_size, pool)
+            for tile in tile_list
+        ]
+        if n_threads > 1:
+            # the lower bounds are computed by numpy and the exact distances by the pool of processes, so the threads
+            # spend most of their time without the GIL
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                tile_neighbors_list = executor.map(
+                    _compute_tile_neighbors, tile_args_list
+                )
+                for tile, tile_neighbors in zip(tile_list, tile_neighbors_list):
+                    neighbor_store.add(tile, *tile_neighbors)
+        else:
+            for tile, tile_args in zip(tile_list, tile_args_list):
+                neighbor_store.add(tile, *_compute_tile_neighbors(tile_args))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return neighbor_store.get_csr()
+
+
+def _split_memory(series_summary, max_memory):
+    if max_memory is None:
+        return None, None
+    free_memory = max(max_memory - series_summary.get_memory(), 0)
+    return free_memory / 2, free_memory / 2
+
+
+def _get_tile_and_chunk_sizes(series_summary, work_memory, n_threads):
+    if work_memory is None:
+        return DEFAULT_TILE_SIZE, None
+    # each thread gets an equal share of the memory
+    thread_memory = work_memory / n_threads
+    # LB_Kim takes a few arrays of shape (tile_size^2, n_dim) and LB_Keogh a few arrays of shape (chunk_size,
+    # max_length, n_dim)
+    tile_size = int(np.sqrt(thread_memory / (series_summary.n_dim * LB_BYTES_PER_OBS)))
+    tile_size = min(max(tile_size, 1), DEFAULT_TILE_SIZE)
+    pair_memory = series_summary.max_length * series_summary.n_dim * LB_BYTES_PER_OBS
+    chunk_size = max(int(thread_memory // pair_memory), 1)
+    return tile_size, chunk_size
+
+
+def _compute_tile_neighbors(tile_args):
+    """
+    This function finds the pairs (i, j), with i < j, of a tile of the pairwise comparison whose DTW distance is lower
+    than max_dist. dtaidistance's DTW distance is the square root of the sum of the squared euclidean distances along
+    the warping path, so the lower bounds (LB_Kim and LB_Keogh, see `compute_ndim_dtw_neighbors`) are compared in
+    squared form.
+
+    :param tile_args: tuple (tile, series_summary, max_dist, tile_size, chunk_size, pool), where tile is the pair (first
+    row, first column) of the tile, chunk_size is the number of pairs whose LB_Keogh is computed at once (None for all)
+    and pool is the pool of processes that computes the exact distances (None to compute them in this process)
+    :type tile_args: tuple
+    :return: tuple (rows, cols, dists) with the pairs within max_dist, sorted by row and column, and their distances
+    :rtype: tuple of 1D array
+    """
+    tile, series_summary, max_dist, tile_size, chunk_size, pool = tile_args
+    n_ts = series_summary.n_ts
+    row_index, col_index = np.meshgrid(
+        np.arange(tile[0], min(tile[0] + tile_size, n_ts)),
+        np.arange(tile[1], min(tile[1] + tile_size, n_ts)),
+        indexing="ij",
+    )
+    is_upper = row_index < col_index
+    row_index = row_index[is_upper]
+    col_index = col_index[is_upper]
+    max_sq_dist = max_dist**2 * (1 + LB_TOLERANCE)
+    is_candidate = series_summary.get_lb_kim(row_index, col_index) < max_sq_dist
+    row_index = row_index[is_candidate]
+    col_index = col_index[is_candidate]
+    if chunk_size is None:
+        chunk_size = max(len(row_index), 1)
+    is_candidate = np.zeros(len(row_index), dtype=bool)
+    for chunk_start in range(0, len(row_index), chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        lb_keogh = np.maximum(
+            series_summary.get_lb_keogh(row_index[chunk], col_index[chunk]),
+            series_summary.get_lb_keogh(col_index[chunk], row_index[chunk]),
+        )
+        is_candidate[chunk] = lb_keogh < max_sq_dist
+    row_index = row_index[is_candidate]
+    col_index = col_index[is_candidate]
+    ts_list = series_summary.ts_list
+    args_list = [
+        (ts_list[i], ts_list[j], max_dist)
+        for i, j in zip(row_index.tolist(), col_index.tolist())
+    ]
+    if len(args_list) == 0:
+        pair_dist = np.zeros(0)
+    elif pool is not None:
+        pair_dist = np.array(pool.map(_compute_pair_distance, args_list))
+    else:
+        pair_dist = np.array([_compute_pair_distance(args) for args in args_list])
+    is_neighbor = pair_dist < max_dist
+    return row_index[is_neighbor], col_index[is_neighbor], pair_dist[is_neighbor]
+
+
+def _compute_pair_distance(args):
+    s1, s2, max_dist = args
+    return dtw_ndim.distance(s1, s2, max_dist=max_dist)
+
+
+class _SeriesSummary(object):
+    """
+    Summary of a list of multidimensional time-series with what the lower bounds of the DTW distance need: the first
+    and last observations, the envelopes and the time-series padded to the same length (the padding is masked out of the
+    LB_Keogh sums).
+    """
+
+    def __init__(self, ts_list):
+        self.ts_list = ts_list
+        self.n_ts = len(ts_list)
+        self.lengths = np.array([len(ts) for ts in ts_list], dtype=np.int64)
+        self.max_length = int(self.lengths.max()) if self.n_ts > 0 else 0
+        self.n_dim = np.shape(ts_list[0])[1] if self.n_ts > 0 else 1
+        self.first_obs = np.array([ts[0] for ts in ts_list], dtype=np.float64)
+        self.last_obs = np.array([ts[-1] for ts in ts_list], dtype=np.float64)
+        self.lower = np.array([np.min(ts, axis=0) for ts in ts_list], dtype=np.float64)
+        self.upper = np.array([np.max(ts, axis=0) for ts in ts_list], dtype=np.float64)
+        self.padded_ts = np.zeros((self.n_ts, self.max_length, self.n_dim))
+        for i, ts in enumerate(ts_list):
+            self.padded_ts[i, : self.lengths[i]] = ts
+        self.mask = np.arange(self.max_length) < self.lengths[:, None]
+
+    def get_memory(self):
+        # bytes of the arrays of the summary, which are dominated by the padded copy of the time-series
+        return sum(
+            array.nbytes
+            for array in [
+                self.lengths,
+                self.first_obs,
+                self.last_obs,
+                self.lower,
+                self.upper,
+                self.padded_ts,
+                self.mask,
+            ]
+        )
+
+    def get_lb_kim(self, index_1, index_2):
+        lb_kim = np.sum(
+            (self.first_obs[index_1] - self.first_obs[index_2]) ** 2, axis=1
+        )
+        # the first and last observations are the same cell of the warping path when both time-series have length 1
+        has_two_cells = (self.lengths[index_1] > 1) | (self.lengths[index_2] > 1)
+        lb_kim[has_two_cells] += np.sum(
+            (
+                self.last_obs[index_1[has_two_cells]]
+                - self.last_obs[index_2[has_two_cells]]
+            )
+            ** 2,
+            axis=1,
+        )
+        return lb_kim
+
+    def get_lb_keogh(self, index_1, index_2):
+        # squared distance of each observation of the first time-series to the envelope of the second one, summed over
+        # the observations
+        padded_ts = self.padded_ts[index_1]
+        obs_dist = np.maximum(padded_ts - self.upper[index_2][:, None], 0) + np.maximum(
+            self.lower[index_2][:, None] - padded_ts, 0
+        )
+        return np.sum(np.sum(obs_dist**2, axis=2) * self.mask[index_1], axis=1)
+
+
+class _NeighborStore(object):
+    """
+    Neighbors found in the tiles of `compute_ndim_dtw_neighbors`, which are only assembled in the CSR format at the
+    end. The neighbors of each tile are kept in memory until they reach max_memory and are written to spill_folder
+    afterwards.
+    """
+
+    def __init__(self, n_ts, tile_size, max_memory, spill_folder):
+        self.n_ts = n_ts
+        self.tile_size = tile_size
+        self.max_memory = max_memory
+        self.spill_folder = spill_folder
+        # each time-series is a neighbor of itself
+        self.counts = np.ones(n_ts, dtype=np.int64)
+        self._tile_neighbors = {}
+        self._n_bytes = 0
+        self._tile_folder = None
+
+    def add(self, tile, rows, cols, dists):
+        self.counts += np.bincount(rows, minlength=self.n_ts)
+        self.counts += np.bincount(cols, minlength=self.n_ts)
+        tile_neighbors = (rows, cols, dists)
+        n_bytes = rows.nbytes + cols.nbytes + dists.nbytes
+        if (self.max_memory is not None) and (
+            self._n_bytes + n_bytes > self.max_memory
+        ):
+            tile_neighbors = self._spill_tile(tile, tile_neighbors)
+        else:
+            self._n_bytes = self._n_bytes + n_bytes
+        self._tile_neighbors[tile] = tile_neighbors
+
+    def _spill_tile(self, tile, tile_neighbors):
+        if self._tile_folder is None:
+            self._tile_folder = tempfile.mkdtemp(dir=self.spill_folder)
+        spilled_neighbors = []
+        for name, array in zip(["rows", "cols", "dists"], tile_neighbors):
+            file_path = os.path.join(
+                self._tile_folder, "{}_{}_{}.npy".format(name, *tile)
+            )
+            np.save(file_path, array)
+            spilled_neighbors.append(np.load(file_path, mmap_mode="r"))
+        return tuple(spilled_neighbors)
+
+    def _allocate(self, size, dtype):
+        if (self.max_memory is not None) and (
+            2 * size * np.dtype(dtype).itemsize > self.max_memory
+        ):
+            # the file is deleted when it is closed, which only happens when the memory map is released
+            return np.memmap(
+                tempfile.TemporaryFile(dir=self.spill_folder),
+                dtype=dtype,
+                mode="w+",
+                shape=(size,),
+            )
+        return np.empty(size, dtype=dtype)
+
+    def get_csr(self):
+        """
+        :return: tuple (indptr, indices, dists) with all the neighbors (see `compute_ndim_dtw_neighbors`)
+        :rtype: tuple of 1D array
+        """
+        indptr = np.concatenate(([0], np.cumsum(self.counts)))
+        indices = self._allocate(int(indptr[-1]), np.int64)
+        dists = self._allocate(int(indptr[-1]), np.float64)
+        # the rows are assembled one block of tile_size rows at a time: the neighbors of a block are in the tiles of its
+        # rows (i.e. (row, col) pairs) and in the tiles of its columns (i.e. (col, row) pairs)
+        for block_start in range(0, self.n_ts, self.tile_size):
+            block_end = min(block_start + self.tile_size, self.n_ts)
+            block_rows = np.arange(block_start, block_end)
+            row_list = [block_rows]
+            col_list = [block_rows]
+            dist_list = [np.zeros(len(block_rows))]
+            for tile_start in range(0, self.n_ts, self.tile_size):
+                if tile_start >= block_start:
+                    rows, cols, tile_dists = self._tile_neighbors[
+                        (block_start, tile_start)
+                    ]
+                    row_list += [rows]
+                    col_list += [cols]
+                    dist_list += [tile_dists]
+                if tile_start <= block_start:
+                    rows, cols, tile_dists = self._tile_neighbors[
+                        (tile_start, block_start)
+                    ]
+                    row_list += [cols]
+                    col_list += [rows]
+                    dist_list += [tile_dists]
+            rows = np.concatenate(row_list)
+            cols = np.concatenate(col_list)
+            order = np.lexsort((cols, rows))
+            indices[indptr[block_start] : indptr[block_end]] = cols[order]
+            dists[indptr[block_start] : indptr[block_end]] = np.concatenate(dist_list)[
+                order
+            ]
+        self._tile_neighbors = {}
+        if self._tile_folder is not None:
+            shutil.rmtree(self._tile_folder)
+            self._tile_folder = None
+        return indptr, indices, dists
+
+
+class DTWPivotIndex(object):
+    """
+    Index of a list of multidimensional time-series that bounds the number of neighbors (i.e. time-series whose DTW
+    distance is lower than max_dist) of each time-series without computing all the pairwise distances. A few pivots
+    are chosen (the first time-series and then, successively, the one farthest from all the previous pivots) and their
+    distance to all the time-series is computed. If the distance satisfied the triangle inequality, then any
+    neighbor x of a time-series c would have |d(p, x) - d(p, c)| < max_dist for every pivot p, which gives an upper
+    bound of the number of neighbors of c. The distances to the pivots are abandoned and capped at PIVOT_DIST_FACTOR
+    times max_dist, which only loosens the bounds (capping a distance never increases the difference between two of
+    them), so the far time-series do not cost a full DTW.
+
+    DTW does not satisfy the triangle inequality, so the bounds are approximate: they hold whenever the triangle
+    inequality holds among the time-series involved, but they can be lower than the real number of neighbors
+    otherwise. They are only meant to order and skip the candidates, while `get_neighbors` returns all the exact
+    neighbors of a time-series.
+
+    Args:
+        ts_list (list of 2D array): list of multidimensional time-series, each one with shape (length, n_dim).
+        max_dist (float): distance threshold of the neighbors. If it is None, all the time-series are neighbors, as in
+        `compute_ndim_dtw_neighbors`.
+        n_pivots (int): number of pivots.
+        parallel (bool): whether the distances are computed in parallel (with a pool of processes, which is kept until
+        `close` is called).
+
+    Attributes:
+        pivots (list of int): indices of the pivots in ts_list.
+        pivot_dists (numpy.array): array of shape (n_pivots, n_ts) with the DTW distances of each pivot to all the
+        time-series.
+        count_upper_bounds (numpy.array): upper bound of the number of neighbors of each time-series (including
+        itself).
+    """
+
+    def __init__(self, ts_list, max_dist, n_pivots, parallel=True):
+        """
+        Constructor for the DTWPivotIndex class.
+
+        Args:
+            ts_list (list of 2D array): list of multidimensional time-series, each one with shape (length, n_dim).
+            max_dist (float): distance threshold of the neighbors.
+            n_pivots (int): number of pivots.
+            parallel (bool): whether the distances are computed in parallel.
+        """
+        if max_dist is None:
+            max_dist = np.inf
+        self.ts_list = ts_list
+        self.max_dist = max_dist
+        self._series_summary = _SeriesSummary(ts_list)
+        n_ts = len(ts_list)
+        self.pivots = []
+        pivot_dist_list = []
+        min_pivot_dist = np.full(n_ts, np.inf)
+        max_pivot_dist = PIVOT_DIST_FACTOR * max_dist
+        self._pool = mp.Pool() if parallel else None
+        try:
+            next_pivot = 0
+            for _ in range(min(n_pivots, n_ts)):
+                self.pivots.append(next_pivot)
+                args_list = [
+                    _get_pair_args(ts_list, next_pivot, i, max_pivot_dist)
+                    for i in range(n_ts)
+                ]
+                pivot_dist = np.minimum(
+                    _compute_pair_distances(args_list, self._pool), max_pivot_dist
+                )
+                pivot_dist_list.append(pivot_dist)
+                min_pivot_dist = np.minimum(min_pivot_dist, pivot_dist)
+                next_pivot = int(np.argmax(min_pivot_dist))
+        except BaseException:
+            self.close()
+            raise
+        self.pivot_dists = np.array(pivot_dist_list).reshape(-1, n_ts)
+        self.count_upper_bounds = np.full(n_ts, n_ts, dtype=np.int64)
+        for pivot_dist in self.pivot_dists:
+            sorted_dist = np.sort(pivot_dist)
+            counts = np.searchsorted(
+                sorted_dist, pivot_dist + max_dist, side="left"
+            ) - np.searchsorted(sorted_dist, pivot_dist - max_dist, side="right")
+            self.count_upper_bounds = np.minimum(self.count_upper_bounds, counts)
+
+    def get_neighbors(self, index):
+        """
+        :param index: index of the time-series in ts_list
+        :type index: int
+        :return: tuple (indices, dists) with the indices of all the neighbors of the time-series, in increasing order,
+        and their exact distances to it
+        :rtype: tuple of 1D array
+        """
+        return _find_row_neighbors(
+            self._series_summary,
+            index,
+            np.arange(len(self.ts_list)),
+            self.max_dist,
+            self._pool,
+        )
+
+    def close(self):
+        """
+        This function closes the pool of processes of the index, if there is one.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+class DTWMedoidSampler(object):
+    """
+    Sampling-based search of the time-series of a list with the most neighbors (i.e. time-series whose DTW distance is
+    lower than max_dist), whose cost grows linearly with the number of time-series. A sample of sample_size time-series
+    are the candidates and, as in a multi-armed bandit, their fraction of neighbors is estimated with successive
+    batches of sample_size reference time-series (a random permutation of all of them). After each batch, the
+    candidates whose upper confidence bound (by Hoeffding's inequality) is lower than the lower confidence bound of the
+    MEDOID_N_CONTENDERS-th best are eliminated. The sampling stops when only MEDOID_N_CONTENDERS candidates remain,
+    when the confidence intervals are narrower than MEDOID_TOLERANCE (so the remaining candidates are all close to the
+    best one) or when all the references were used. The number of references is thus bounded by a constant that does
+    not depend on the number of time-series. The MEDOID_N_CONTENDERS remaining candidates with the highest fractions
+    are the contenders, whose exact neighbors are then computed with `get_neighbors`.
+
+    Args:
+        ts_list (list of 2D array): list of multidimensional time-series, each one with shape (length, n_dim).
+        max_dist (float): distance threshold of the neighbors. If it is None, all the time-series are neighbors, as in
+        `compute_ndim_dtw_neighbors`.
+        sample_size (int): number of sampled candidates and of reference time-series of each batch.
+        seed (int): seed of the random samples.
+        parallel (bool): whether the distances are computed in parallel (with a pool of processes, which is kept until
+        `close` is called).
+
+    Attributes:
+        candidates (numpy.array): indices of the sampled candidates, in increasing order.
+        neighbor_fractions (numpy.array): estimated fraction of neighbors of each candidate when it was eliminated (or
+        at the end, for the ones that were not eliminated).
+        n_references (numpy.array): number of reference time-series with which each candidate was compared.
+        contenders (numpy.array): indices of the candidates with the highest estimated fractions, in increasing order.
+    """
+
+    def __init__(self, ts_list, max_dist, sample_size, seed=0, parallel=True):
+        """
+        Constructor for the DTWMedoidSampler class.
+
+        Args:
+            ts_list (list of 2D array): list of multidimensional time-series, each one with shape (length, n_dim).
+            max_dist (float): distance threshold of the neighbors.
+            sample_size (int): number of sampled candidates and of reference time-series of each batch.
+            seed (int): seed of the random samples.
+            parallel (bool): whether the distances are computed in parallel.
+        """
+        if max_dist is None:
+            max_dist = np.inf
+        self.ts_list = ts_list
+        self.max_dist = max_dist
+        self._series_summary = _SeriesSummary(ts_list)
+        self._pool = mp.Pool() if parallel else None
+        try:
+            self._sample_candidates(sample_size, seed)
+        except BaseException:
+            self.close()
+            raise
+
+    def _sample_candidates(self, sample_size, seed):
+        ts_list = self.ts_list
+        max_dist = self.max_dist
+        n_ts = len(ts_list)
+        rng = np.random.default_rng(seed)
+        self.candidates = np.sort(
+            rng.choice(n_ts, size=min(sample_size, n_ts), replace=False)
+        )
+        reference_order = rng.permutation(n_ts)
+        n_candidates = len(self.candidates)
+        neighbor_counts = np.zeros(n_candidates)
+        self.neighbor_fractions = np.zeros(n_candidates)
+        self.n_references = np.zeros(n_candidates, dtype=np.int64)
+        # estimated fractions of all the candidates when each one was eliminated, which measure the gap to the chosen
+        # medoid in `get_confidence`
+        self._fractions_at_elimination = np.zeros((n_candidates, n_candidates))
+        is_active = np.ones(n_candidates, dtype=bool)
+        n_references = 0
+        for batch_start in range(0, n_ts, sample_size):
+            references = reference_order[batch_start : batch_start + sample_size]
+            for i in np.flatnonzero(is_active).tolist():
+                neighbor_index, _ = _find_row_neighbors(
+                    self._series_summary,
+                    self.candidates[i],
+                    references,
+                    max_dist,
+                    self._pool,
+                )
+                neighbor_counts[i] += len(neighbor_index)
+            n_references = n_references + len(references)
+            fractions = neighbor_counts / n_references
+            self.neighbor_fractions[is_active] = fractions[is_active]
+            self.n_references[is_active] = n_references
+            interval = np.sqrt(
+                np.log(2 * n_candidates / MEDOID_DELTA) / (2 * n_references)
+            )
+            if (np.sum(is_active) <= MEDOID_N_CONTENDERS) or (
+                interval < MEDOID_TOLERANCE
+            ):
+                break
+            contender_lower_bound = (
+                np.sort(fractions[is_active])[-MEDOID_N_CONTENDERS] - interval
+            )
+            is_eliminated = is_active & (fractions + interval < contender_lower_bound)
+            self._fractions_at_elimination[is_eliminated] = fractions
+            is_active = is_active & ~is_eliminated
+        for i in np.flatnonzero(is_active).tolist():
+            self._fractions_at_elimination[i] = self.neighbor_fractions
+        # the contenders are the active candidates with the highest fractions (the first ones in case of ties)
+        active = np.flatnonzero(is_active)
+        order = np.argsort(-self.neighbor_fractions[active], kind="stable")
+        self.contenders = np.sort(self.candidates[active[order[:MEDOID_N_CONTENDERS]]])
+
+    def get_neighbors(self, index):
+        """
+        :param index: index of the time-series in ts_list
+        :type index: int
+        :return: tuple (indices, dists) with the indices of all the neighbors of the time-series, in increasing order,
+        and their exact distances to it
+        :rtype: tuple of 1D array
+        """
+        return _find_row_neighbors(
+            self._series_summary,
+            index,
+            np.arange(len(self.ts_list)),
+            self.max_dist,
+            self._pool,
+        )
+
+    def get_confidence(self, medoid):
+        """
+        This function computes the confidence that the chosen medoid is at least as good as a candidate in the top
+        MEDOID_QUANTILE fraction of all the time-series (by number of neighbors): either it has at least as many
+        neighbors as that candidate or it was preferred to it when the contenders were refined. It is a lower bound of
+        the probability of two events (one minus the sum of the probabilities of their failures):
+
+        - some sampled candidate is in the top fraction. The candidates are sampled uniformly without replacement, so
+        this fails with probability C(n - k, m) / C(n, m) <= (1 - MEDOID_QUANTILE)^m, where n is the number of
+        time-series, m the number of sampled candidates and k the size of the top fraction. It is 0 only if all the
+        time-series were sampled (or if m > n - k).
+        - the medoid has at least the same fraction of neighbors as all the sampled candidates that were not refined.
+        For each of those candidates, the estimated fractions of both are compared in the references that they share
+        and, by Hoeffding's inequality, the probability of a gap at least as large as the observed one when the
+        candidate actually has more neighbors is at most exp(-n * gap^2 / 2) (or exactly 0 or 1, if they were compared
+        with all the time-series). This fails with at most the sum of these probabilities.
+
+        So the confidence is 1 only when all the time-series were sampled and the medoid's fraction is exact, and it
+        measures how far the sample can be trusted otherwise.
+
+        :param medoid: index in ts_list of the chosen medoid, which must be one of the contenders
+        :type medoid: int
+        :return: confidence, between 0 and 1
+        :rtype: float
+        """
+        n_ts = len(self.ts_list)
+        n_candidates = len(self.candidates)
+        n_top = int(np.ceil(MEDOID_QUANTILE * n_ts))
+        # probability that no sampled candidate is in the top fraction, as a product of m factors
+        sample_miss_probability = float(
+            np.prod(
+                np.maximum(n_ts - n_top - np.arange(n_candidates), 0)
+                / (n_ts - np.arange(n_candidates))
+            )
+        )
+        medoid_position = int(np.searchsorted(self.candidates, medoid))
+        is_refined = np.isin(self.candidates, self.contenders)
+        gaps = np.maximum(
+            self._fractions_at_elimination[:, medoid_position]
+            - np.diag(self._fractions_at_elimination),
+            0,
+        )
+        error_probabilities = np.exp(-self.n_references * gaps**2 / 2)
+        # the fractions of the candidates that were compared with all the time-series are exact
+        is_exact = self.n_references == n_ts
+        error_probabilities[is_exact] = (
+            np.diag(self._fractions_at_elimination)
+            > self._fractions_at_elimination[:, medoid_position]
+        )[is_exact]
+        return float(
+            max(
+                1 - sample_miss_probability - np.sum(error_probabilities[~is_refined]),
+                0,
+            )
+        )
+
+    def close(self):
+        """
+        This function closes the pool of processes of the sampler, if there is one.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+def _get_pair_args(ts_list, index_1, index_2, max_dist):
+    # the distance is always computed with the lowest index first, as in `compute_ndim_dtw_neighbors`
+    if index_1 > index_2:
+        index_1, index_2 = index_2, index_1
+    return ts_list[index_1], ts_list[index_2], max_dist
+
+
+def _compute_pair_distances(args_list, pool=None):
+    if (pool is not None) and (len(args_list) > 1):
+        return np.array(pool.map(_compute_pair_distance, args_list), dtype=np.float64)
+    return np.array(
+        [_compute_pair_distance(args) for args in args_list], dtype=np.float64
+    )
+
+
+def _find_row_neighbors(series_summary, index, other_index, max_dist, pool=None):
+    """
+    This function finds the neighbors of a single time-series among some of the others, with the same lower bounds
+    and exact distances as `compute_ndim_dtw_neighbors`.
+
+    :param series_summary: summary of all the time-series.
+    :type series_summary: tripMD.dtwdist._SeriesSummary
+    :param index: index of the time-series
+    :type index: int
+    :param other_index: indices of the time-series where the neighbors are searched. If it includes index, then the
+    time-series is a neighbor of itself, with distance 0
+    :type other_index: 1D array
+    :param max_dist: distance threshold of the neighbors
+    :type max_dist: float
+    :param pool: pool of processes that computes the exact distances. It defaults to None, in which case they are
+    computed in this process
+    :type pool: multiprocessing.Pool
+    :return: tuple (indices, dists) with the indices of the neighbors, in increasing order, and their distances
+    :rtype: tuple of 1D array
+    """
+    other_index = np.asarray(other_index, dtype=np.int64)
+    includes_itself = bool(np.any(other_index == index))
+    other_index = other_index[other_index != index]
+    index_array = np.full(len(other_index), index)
+    max_sq_dist = max_dist**2 * (1 + LB_TOLERANCE)
+    is_candidate = series_summary.get_lb_kim(index_array, other_index) < max_sq_dist
+    index_array = index_array[is_candidate]
+    other_index = other_index[is_candidate]
+    lb_keogh = np.maximum(
+        series_summary.get_lb_keogh(index_array, other_index),
+        series_summary.get_lb_keogh(other_index, index_array),
+    )
+    other_index = other_index[lb_keogh < max_sq_dist]
+    other_dist = _compute_pair_distances(
+        [
+            _get_pair_args(series_summary.ts_list, index, i, max_dist)
+            for i in other_index.tolist()
+        ],
+        pool,
+    )
+    is_neighbor = other_dist < max_dist
+    indices = other_index[is_neighbor]
+    dists = other_dist[is_neighbor]
+    if includes_itself:
+        indices = np.append(indices, index)
+        dists = np.append(dists, 0.0)
+    order = np.argsort(indices)
+    return indices[order], dists[order]
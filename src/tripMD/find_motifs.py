@@ -1,30 +1,164 @@
 import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from tripMD.vsax.objects.vsax_sequence import VSaxSequence
 from tripMD.objects.motif import Motif
 
+MOTIF_ENGINES = ["apriori", "suffix_array"]
+# each worker gets several tasks per level, so that a slow task does not leave the other workers idle
+TASKS_PER_JOB = 4
+
+# trips of the worker processes, set once when each worker starts (see `_init_worker`)
+_worker_trip_list = None
+
 
 def find_all_motifs_in_trip_list(
-    trip_list, default_letter_size, min_word_size, max_radius, compute_mdl=False,
+    trip_list,
+    default_letter_size,
+    min_word_size,
+    max_radius,
+    compute_mdl=False,
+    engine="apriori",
+    count_sketch_width=None,
+    n_jobs=1,
+    max_memory=None,
+    n_threads=1,
+    pivot_pruning=False,
+    n_pivots=8,
+    medoid_threshold=None,
+    medoid_sample_size=100,
 ):
     vsax_sequence = VSaxSequence(trip_list, default_letter_size)
+    motif_list = find_all_motifs_in_vsax_sequence(
+        vsax_sequence,
+        min_word_size,
+        max_radius,
+        compute_mdl,
+        engine,
+        count_sketch_width,
+        n_jobs,
+        max_memory,
+        n_threads,
+        pivot_pruning,
+        n_pivots,
+        medoid_threshold,
+        medoid_sample_size,
+    )
+    return motif_list
+
+
+def find_all_motifs_in_vsax_sequence(
+    vsax_sequence,
+    min_word_size,
+    max_radius,
+    compute_mdl=False,
+    engine="apriori",
+    count_sketch_width=None,
+    n_jobs=1,
+    max_memory=None,
+    n_threads=1,
+    pivot_pruning=False,
+    n_pivots=8,
+    medoid_threshold=None,
+    medoid_sample_size=100,
+):
+    # the vsax sequence can be reused between runs (e.g., after adding new trips with `VSaxSequence.add_trips`)
+    if engine not in MOTIF_ENGINES:
+        raise Exception(
+            "The engine {} is not valid. Choose one of {}".format(engine, MOTIF_ENGINES)
+        )
+    suffix_array = None
+    if engine == "suffix_array":
+        suffix_array = vsax_sequence.get_suffix_array()
+    # options of the DTW computation of each motif (see `Motif.__init__`)
+    motif_kwargs = {
+        "max_memory": max_memory,
+        "n_threads": n_threads,
+        "pivot_pruning": pivot_pruning,
+        "n_pivots": n_pivots,
+        "medoid_threshold": medoid_threshold,
+        "medoid_sample_size": medoid_sample_size,
+    }
+    if n_jobs > 1:
+        # the trips are sent once to each worker when it starts. A tripMD.objects.trip_store.TripStore is pickled as
+        # its path only, so all the workers share the same memory-mapped copy of the data
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(vsax_sequence.trip_list,),
+        ) as executor:
+            return _find_all_motifs(
+                vsax_sequence,
+                min_word_size,
+                max_radius,
+                compute_mdl,
+                suffix_array,
+                count_sketch_width,
+                motif_kwargs,
+                executor,
+                n_jobs,
+            )
+    return _find_all_motifs(
+        vsax_sequence,
+        min_word_size,
+        max_radius,
+        compute_mdl,
+        suffix_array,
+        count_sketch_width,
+        motif_kwargs,
+    )
+
+
+def _find_all_motifs(
+    vsax_sequence,
+    min_word_size,
+    max_radius,
+    compute_mdl,
+    suffix_array,
+    count_sketch_width,
+    motif_kwargs,
+    executor=None,
+    n_jobs=1,
+):
     motif_list = []
     word_size = min_word_size
+    word_table = None
     while True:
         start_time = time.time()
-        word_list = vsax_sequence.get_word_list(word_size)
-        word_str_list = [word.get_str_rep() for word in word_list]
-        word_patterns = set(word_str_list)
+        # if the pattern appears only once, then it is not a motif
+        word_table = _get_repeated_word_table(
+            vsax_sequence, word_size, word_table, suffix_array, count_sketch_width
+        )
         # if there are no repeating patterns of size word_size, then there are no more motifs and the loop ends
-        if len(word_str_list) == len(word_patterns):
+        if (word_table is None) or (len(word_table) == 0):
             break
         else:
-            for pattern in word_patterns:
-                # if the pattern appears only once, then it is not a motif
-                if word_str_list.count(pattern) < 2:
-                    continue
-                else:
-                    pattern_motif = Motif(pattern, max_radius, compute_mdl)
-                    pattern_motif.compute_center_and_members(vsax_sequence, word_list)
+            word_list = word_table.get_word_list()
+            # all the words are grouped by pattern at once, so that each motif gets its candidates directly
+            pattern_rows = word_table.get_pattern_rows()
+            if executor is not None:
+                motif_list.extend(
+                    _compute_motifs_in_parallel(
+                        vsax_sequence,
+                        word_table,
+                        word_list,
+                        pattern_rows,
+                        max_radius,
+                        compute_mdl,
+                        motif_kwargs,
+                        executor,
+                        n_jobs,
+                    )
+                )
+            else:
+                for pattern_id in range(word_table.get_n_patterns()):
+                    pattern = word_table.get_pattern(pattern_id)
+                    pattern_motif = Motif(
+                        pattern, max_radius, compute_mdl, **motif_kwargs
+                    )
+                    pattern_motif.compute_center_and_members(
+                        vsax_sequence, word_list, pattern_rows[pattern_id]
+                    )
                     # if the pattern only has one member, then it is not a motif
                     if len(pattern_motif.get_members()) == 1:
                         continue
@@ -35,6 +169,119 @@ def find_all_motifs_in_trip_list(
     return motif_list
 
 
+def _get_repeated_word_table(
+    vsax_sequence, word_size, previous_word_table, suffix_array, count_sketch_width
+):
+    if suffix_array is not None:
+        # the words of all patterns that repeat are read directly from the suffix array, which also tells when there
+        # are no more repeating patterns (i.e. when word_size is longer than the longest common prefix of two suffixes)
+        if word_size > suffix_array.get_max_repeat_size():
+            return None
+        trip_index, first_letter = suffix_array.get_repeated_words(word_size)
+        return vsax_sequence.get_word_table(word_size, trip_index, first_letter)
+    if previous_word_table is None:
+        # the first size is counted by hash before reading any word, so the words whose pattern does not repeat (most
+        # of them) are never built
+        return vsax_sequence.get_repeated_word_table(word_size, count_sketch_width)
+    else:
+        # a pattern can only repeat if its prefix with one letter less also repeats, so the words of this size are
+        # only searched among the extensions of the previous size's words with repeating patterns
+        word_table = previous_word_table.get_extended_words()
+        return word_table.get_repeated_words()
+
+
+def _compute_motifs_in_parallel(
+    vsax_sequence,
+    word_table,
+    word_list,
+    pattern_rows,
+    max_radius,
+    compute_mdl,
+    motif_kwargs,
+    executor,
+    n_jobs,
+):
+    task_list = _split_patterns_in_tasks(word_table, n_jobs)
+    future_list = []
+    for pattern_id_list in task_list:
+        task = []
+        for pattern_id in pattern_id_list:
+            pattern = word_table.get_pattern(pattern_id)
+            candidate_word_list = Motif.slice_list(word_list, pattern_rows[pattern_id])
+            task.append(
+                (pattern, vsax_sequence.decode_pattern(pattern), candidate_word_list)
+            )
+        future_list.append(
+            executor.submit(_compute_motif_batch, task, max_radius, motif_kwargs)
+        )
+    motif_dict = {}
+    for pattern_id_list, future in zip(task_list, future_list):
+        motif_dict.update(zip(pattern_id_list, future.result()))
+    # the motifs are gathered in pattern order, so the result does not depend on the number of jobs
+    motif_list = []
+    for pattern_id in range(word_table.get_n_patterns()):
+        pattern_motif = motif_dict[pattern_id]
+        # if the pattern only has one member, then it is not a motif
+        if len(pattern_motif.get_members()) == 1:
+            continue
+        # the MDL cost needs the letters of all trips, which only the main process has
+        if compute_mdl:
+            pattern_motif.compute_mdl = True
+            pattern_motif.update_mdl_cost(vsax_sequence, word_list)
+        motif_list.append(pattern_motif)
+    return motif_list
+
+
+def _split_patterns_in_tasks(word_table, n_jobs):
+    # the cost of a pattern is estimated as the cost of its DTW distance matrix: the number of pairs of candidates
+    # times the squared length of the words
+    pattern_counts = word_table.get_pattern_counts()
+    pattern_lengths = np.bincount(
+        word_table.pattern_id,
+        weights=word_table.end - word_table.start,
+        minlength=word_table.get_n_patterns(),
+    ) / np.maximum(pattern_counts, 1)
+    pattern_costs = pattern_counts.astype(np.float64) ** 2 * pattern_lengths**2
+    target_cost = pattern_costs.sum() / (n_jobs * TASKS_PER_JOB)
+    # patterns that are expensive enough get a task of their own and are submitted first, so that they do not end up
+    # running alone after all the others. The remaining ones are grouped, in pattern order, in tasks of similar cost
+    large_task_list = []
+    small_task_list = []
+    current_task = []
+    current_cost = 0.0
+    for pattern_id, cost in enumerate(pattern_costs.tolist()):
+        if cost >= target_cost:
+            large_task_list.append((cost, [pattern_id]))
+            continue
+        current_task.append(pattern_id)
+        current_cost = current_cost + cost
+        if current_cost >= target_cost:
+            small_task_list.append(current_task)
+            current_task = []
+            current_cost = 0.0
+    if len(current_task) > 0:
+        small_task_list.append(current_task)
+    large_task_list.sort(key=lambda x: x[0], reverse=True)
+    return [task for _, task in large_task_list] + small_task_list
+
+
+def _init_worker(trip_list):
+    global _worker_trip_list
+    _worker_trip_list = trip_list
+
+
+def _compute_motif_batch(task, max_radius, motif_kwargs):
+    # each worker already runs in its own process, so the DTW distances of each motif are computed serially
+    motif_list = []
+    for pattern, str_pattern, candidate_word_list in task:
+        pattern_motif = Motif(pattern, max_radius, False, str_pattern, **motif_kwargs)
+        pattern_motif.compute_center_and_members_from_candidates(
+            _worker_trip_list, candidate_word_list, parallel=False
+        )
+        motif_list.append(pattern_motif)
+    return motif_list
+
+
 def print_time(word_size, start_time):
     time_diff = time.time() - start_time
     if time_diff > 3600:
@@ -1,10 +1,116 @@
+import os
+import json
 import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from tripMD.objects.trip import Trip
+from tripMD.objects.trip_store import TripStore
 
+MANIFEST_FILE = "manifest.json"
 
-def load_trips_from_folder(folder_path):
-    # todo: implement load_trips_from_folder
-    pass
+
+def load_trips_from_folder(folder_path, n_jobs=None):
+    """
+    Loads the trips saved in a folder with one binary file per trip, as written by `save_trips_to_folder`. Each trip is
+    either a `.npy` file with the (n_obs, n_dim) array of signals or a `.npz` file with the `signals` array and,
+    optionally, the `timestamps` and `labels_<i>` arrays. The folder's `manifest.json` lists the trip ids and their
+    files, in order. If there is no manifest, all `.npy`/`.npz` files are loaded in name order and their names (without
+    extension) are used as trip ids. The files are read in parallel with a pool of processes. Note that `.npz` labels
+    may be pickled, so only load folders from trusted sources.
+
+    Args:
+        folder_path (str): path to the folder with the trip files.
+        n_jobs (int): number of worker processes. It defaults to None, in which case the number of CPUs is used. With
+        n_jobs=1 the files are read sequentially in the current process.
+
+    Returns:
+        trip_list (list of tripMD.objects.trip.Trip): list with the loaded trips, in the order of the manifest.
+    """
+    manifest_file = os.path.join(folder_path, MANIFEST_FILE)
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        trip_entries = [(entry["id"], entry["file"]) for entry in manifest["trips"]]
+    else:
+        file_names = sorted(
+            name
+            for name in os.listdir(folder_path)
+            if name.endswith(".npy") or name.endswith(".npz")
+        )
+        trip_entries = [(os.path.splitext(name)[0], name) for name in file_names]
+    trip_ids = [trip_id for trip_id, _ in trip_entries]
+    file_paths = [os.path.join(folder_path, file_name) for _, file_name in trip_entries]
+    if n_jobs == 1:
+        trip_list = list(map(_load_trip_file, file_paths, trip_ids))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            n_workers = n_jobs or os.cpu_count() or 1
+            chunksize = max(1, len(file_paths) // (4 * n_workers))
+            trip_list = list(
+                executor.map(_load_trip_file, file_paths, trip_ids, chunksize=chunksize)
+            )
+    return trip_list
+
+
+def save_trips_to_folder(trip_list, folder_path):
+    """
+    Saves a list of trips in the folder format read by `load_trips_from_folder`: one `.npz` file per trip, with the
+    signals, timestamps and labels, plus a `manifest.json` with the trip ids and their files.
+
+    Args:
+        trip_list (list of tripMD.objects.trip.Trip): list of trips to be saved.
+        folder_path (str): path to the folder where the trips are saved. It is created if it does not exist.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    manifest = {"trips": []}
+    for i, trip in enumerate(trip_list):
+        file_name = "trip_{}.npz".format(i)
+        trip_arrays = {
+            "signals": trip.get_obs_array(),
+            "timestamps": np.asarray(trip.get_timestamps()),
+        }
+        if trip.labels is not None:
+            for j, trip_labels in enumerate(trip.labels):
+                trip_arrays["labels_{}".format(j)] = np.asarray(trip_labels)
+        np.savez(os.path.join(folder_path, file_name), **trip_arrays)
+        manifest["trips"].append({"id": np.asarray(trip.id).item(), "file": file_name})
+    with open(os.path.join(folder_path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f)
+
+
+def _load_trip_file(file_path, trip_id):
+    if file_path.endswith(".npy"):
+        obs_array = np.load(file_path)
+        return Trip(list(obs_array.T), trip_id)
+    with np.load(file_path, allow_pickle=True) as trip_arrays:
+        signal_list = list(trip_arrays["signals"].T)
+        if "timestamps" in trip_arrays:
+            timestamps = trip_arrays["timestamps"].tolist()
+        else:
+            timestamps = None
+        label_keys = sorted(
+            (key for key in trip_arrays.files if key.startswith("labels_")),
+            key=lambda key: int(key.split("_")[-1]),
+        )
+        if len(label_keys) == 0:
+            labels_list = None
+        else:
+            labels_list = [trip_arrays[key].tolist() for key in label_keys]
+    return Trip(signal_list, trip_id, timestamps=timestamps, labels_list=labels_list)
+
+
+def load_trips_from_store(folder_path):
+    """
+    Opens a trip store saved with `tripMD.objects.trip_store.save_trip_store`. The returned store can be used in place
+    of a list of trips and its trips are only read from disk when needed.
+
+    Args:
+        folder_path (str): path to the folder where the store was saved.
+
+    Returns:
+        trip_store (tripMD.objects.trip_store.TripStore): store with the trips.
+    """
+    return TripStore(folder_path)
 
 
 def load_trips_from_dataframe(
@@ -13,6 +119,209 @@ def load_trips_from_dataframe(
     excluded_fields=None,
     timestamp_field=None,
     label_fields=None,
+):
+    """
+    Builds the list of trips from a dataframe with one row per observation. The dataframe is sorted once by trip ID
+    (keeping the original order of the observations inside each trip) and every column is converted to numpy a single
+    time, so the load time grows linearly with the number of rows.
+
+    Args:
+        data_df (pandas.DataFrame): dataframe with the observations of all trips.
+        trip_id_field (str): name of the column with the trips' IDs.
+        excluded_fields (set of str): columns that are neither signals, timestamps nor labels and should be ignored.
+        timestamp_field (str): name of the column with the observations' timestamps.
+        label_fields (list of str): names of the columns with the observations' labels.
+
+    Returns:
+        trip_list (list of tripMD.objects.trip.Trip): list of trips, sorted by trip ID.
+    """
+    trip_generator = iter_trips_from_dataframe(
+        data_df, trip_id_field, excluded_fields, timestamp_field, label_fields
+    )
+    return list(trip_generator)
+
+
+def iter_trips_from_dataframe(
+    data_df,
+    trip_id_field,
+    excluded_fields=None,
+    timestamp_field=None,
+    label_fields=None,
+):
+    """
+    Generator that builds the trips of a dataframe one at a time, in the same way and order as
+    `load_trips_from_dataframe`. It can be passed directly to `tripMD.objects.trip_store.save_trip_store`, so that the
+    list of trips is never held in memory next to the dataframe.
+
+    Args:
+        data_df (pandas.DataFrame): dataframe with the observations of all trips.
+        trip_id_field (str): name of the column with the trips' IDs.
+        excluded_fields (set of str): columns that are neither signals, timestamps nor labels and should be ignored.
+        timestamp_field (str): name of the column with the observations' timestamps.
+        label_fields (list of str): names of the columns with the observations' labels.
+
+    Yields:
+        trip (tripMD.objects.trip.Trip): the next trip, sorted by trip ID.
+    """
+    signal_columns_names = _get_signal_columns_names(
+        data_df.columns, trip_id_field, excluded_fields, timestamp_field, label_fields
+    )
+    trip_ids = data_df[trip_id_field].to_numpy()
+    sort_index = np.argsort(trip_ids, kind="stable")
+    unique_trip_ids, trip_starts = np.unique(trip_ids[sort_index], return_index=True)
+    trip_bounds = np.append(trip_starts, len(sort_index))
+    signal_array_list = [
+        data_df[col_name].to_numpy()[sort_index] for col_name in signal_columns_names
+    ]
+    if timestamp_field is None:
+        timestamps_array = None
+    else:
+        timestamps_array = _get_column_array(data_df, timestamp_field)[sort_index]
+    if label_fields is None:
+        labels_array_list = None
+    else:
+        labels_array_list = [
+            _get_column_array(data_df, col_name)[sort_index]
+            for col_name in label_fields
+        ]
+    for i, trip_id in enumerate(unique_trip_ids.tolist()):
+        start, end = trip_bounds[i], trip_bounds[i + 1]
+        yield _build_trip_from_arrays(
+            trip_id, start, end, signal_array_list, timestamps_array, labels_array_list
+        )
+
+
+def iter_trips_from_file(
+    file_path,
+    trip_id_field,
+    excluded_fields=None,
+    timestamp_field=None,
+    label_fields=None,
+    chunksize=100000,
+):
+    """
+    Generator that reads a CSV or Parquet export in chunks and yields the trips one at a time, as soon as all the
+    observations of each trip were read. The file must be sorted by trip ID (and by timestamp inside each trip), so the
+    peak memory is bounded by the largest trip instead of the whole export. The generator can be passed directly to
+    `tripMD.objects.trip_store.save_trip_store` to convert an export that does not fit in memory. Reading Parquet files
+    requires the `pyarrow` package.
+
+    Args:
+        file_path (str): path to the `.csv` or `.parquet` file.
+        trip_id_field (str): name of the column with the trips' IDs.
+        excluded_fields (set of str): columns that are neither signals, timestamps nor labels and should be ignored.
+        timestamp_field (str): name of the column with the observations' timestamps.
+        label_fields (list of str): names of the columns with the observations' labels.
+        chunksize (int): number of rows read at a time.
+
+    Yields:
+        trip (tripMD.objects.trip.Trip): the next trip in the file.
+    """
+    signal_columns_names = None
+    pending_frames = []
+    pending_trip_id = None
+    completed_trip_ids = set()
+    for chunk_df in _iter_file_chunks(file_path, chunksize):
+        if len(chunk_df.index) == 0:
+            continue
+        if signal_columns_names is None:
+            signal_columns_names = _get_signal_columns_names(
+                chunk_df.columns,
+                trip_id_field,
+                excluded_fields,
+                timestamp_field,
+                label_fields,
+            )
+        trip_ids = chunk_df[trip_id_field].to_numpy()
+        segment_starts = np.flatnonzero(trip_ids[1:] != trip_ids[:-1]) + 1
+        segment_bounds = np.concatenate(([0], segment_starts, [len(trip_ids)]))
+        for i in range(len(segment_bounds) - 1):
+            segment_trip_id = trip_ids[segment_bounds[i]]
+            segment_df = chunk_df.iloc[segment_bounds[i] : segment_bounds[i + 1]]
+            if pending_trip_id is not None and segment_trip_id != pending_trip_id:
+                # the pending trip is complete as soon as a different trip id shows up
+                yield _build_trip_from_frames(
+                    pending_frames,
+                    pending_trip_id,
+                    signal_columns_names,
+                    timestamp_field,
+                    label_fields,
+                )
+                completed_trip_ids.add(pending_trip_id)
+                pending_frames = []
+            if segment_trip_id in completed_trip_ids:
+                raise Exception(
+                    "The trip {} is not contiguous in the file. "
+                    "Make sure the file is sorted by trip id".format(segment_trip_id)
+                )
+            pending_trip_id = segment_trip_id
+            pending_frames.append(segment_df)
+    if pending_trip_id is not None:
+        yield _build_trip_from_frames(
+            pending_frames,
+            pending_trip_id,
+            signal_columns_names,
+            timestamp_field,
+            label_fields,
+        )
+
+
+def _iter_file_chunks(file_path, chunksize):
+    if file_path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading parquet files requires the pyarrow package. Install it with `pip install pyarrow`"
+            )
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        for chunk_df in pd.read_csv(file_path, chunksize=chunksize):
+            yield chunk_df
+
+
+def _build_trip_from_frames(
+    trip_frames, trip_id, signal_columns_names, timestamp_field, label_fields
+):
+    trip_df = pd.concat(trip_frames) if len(trip_frames) > 1 else trip_frames[0]
+    signal_array_list = [
+        trip_df[col_name].to_numpy() for col_name in signal_columns_names
+    ]
+    if timestamp_field is None:
+        timestamps_array = None
+    else:
+        timestamps_array = _get_column_array(trip_df, timestamp_field)
+    if label_fields is None:
+        labels_array_list = None
+    else:
+        labels_array_list = [
+            _get_column_array(trip_df, col_name) for col_name in label_fields
+        ]
+    trip_id = np.asarray(trip_id).item()
+    trip = _build_trip_from_arrays(
+        trip_id,
+        0,
+        len(trip_df.index),
+        signal_array_list,
+        timestamps_array,
+        labels_array_list,
+    )
+    return trip
+
+
+def _get_column_array(data_df, col_name):
+    column = data_df[col_name]
+    if column.dtype.kind in "mM":
+        # datetime and timedelta columns are converted to pandas' Timestamp and Timedelta objects, the same elements
+        # that Series.tolist returns, instead of integers
+        column = column.astype(object)
+    return column.to_numpy()
+
+
+def _get_signal_columns_names(
+    columns, trip_id_field, excluded_fields, timestamp_field, label_fields
 ):
     if excluded_fields is None:
         excluded_fields = {trip_id_field}
@@ -22,26 +331,23 @@ def load_trips_from_dataframe(
         excluded_fields = excluded_fields.union(set(label_fields))
     if timestamp_field is not None:
         excluded_fields = excluded_fields.union({timestamp_field})
-    signal_columns_names = sorted(set(data_df.columns).difference(excluded_fields))
-    unique_trip_ids = sorted(set(data_df[trip_id_field]))
-    trip_list = []
-    for trip_id in unique_trip_ids:
-        trip_df = data_df[data_df[trip_id_field] == trip_id].drop(trip_id_field, axis=1)
-        signal_list = [np.array(trip_df[col_name]) for col_name in signal_columns_names]
-        if label_fields is None:
-            if timestamp_field is None:
-                trip = Trip(signal_list, trip_id)
-            else:
-                timestamps = trip_df[timestamp_field].tolist()
-                trip = Trip(signal_list, trip_id, timestamps=timestamps)
-        else:
-            label_list = [trip_df[col_name].tolist() for col_name in label_fields]
-            if timestamp_field is None:
-                trip = Trip(signal_list, trip_id, labels_list=label_list)
-            else:
-                timestamps = trip_df[timestamp_field].tolist()
-                trip = Trip(
-                    signal_list, trip_id, timestamps=timestamps, labels_list=label_list
-                )
-        trip_list.append(trip)
-    return trip_list
+    signal_columns_names = sorted(set(columns).difference(excluded_fields))
+    return signal_columns_names
+
+
+def _build_trip_from_arrays(
+    trip_id, start, end, signal_array_list, timestamps_array, labels_array_list
+):
+    signal_list = [signal_array[start:end] for signal_array in signal_array_list]
+    if timestamps_array is None:
+        timestamps = None
+    else:
+        timestamps = timestamps_array[start:end].tolist()
+    if labels_array_list is None:
+        label_list = None
+    else:
+        label_list = [
+            labels_array[start:end].tolist() for labels_array in labels_array_list
+        ]
+    trip = Trip(signal_list, trip_id, timestamps=timestamps, labels_list=label_list)
+    return trip
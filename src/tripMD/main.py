@@ -26,6 +26,15 @@ class TripMD(object):
         else:
             self._max_radius = None
         self._compute_mdl = True
+        self._motif_engine = "apriori"
+        self._count_sketch_width = None
+        self._n_jobs = 1
+        self._max_memory = None
+        self._n_threads = 1
+        self._pivot_pruning = False
+        self._n_pivots = 8
+        self._medoid_threshold = None
+        self._medoid_sample_size = 100
         self._lat_acc_index = None
         self._lon_acc_index = None
         self._dtw_som_epochs = 20
@@ -45,6 +54,24 @@ class TripMD(object):
                 self._min_word_size = v
             elif k == "max_radius":
                 self._max_radius = v
+            elif k == "motif_engine":
+                self._motif_engine = v
+            elif k == "count_sketch_width":
+                self._count_sketch_width = v
+            elif k == "n_jobs":
+                self._n_jobs = v
+            elif k == "max_memory":
+                self._max_memory = v
+            elif k == "n_threads":
+                self._n_threads = v
+            elif k == "pivot_pruning":
+                self._pivot_pruning = v
+            elif k == "n_pivots":
+                self._n_pivots = v
+            elif k == "medoid_threshold":
+                self._medoid_threshold = v
+            elif k == "medoid_sample_size":
+                self._medoid_sample_size = v
             elif k == "lat_acc_index":
                 self._lat_acc_index = v
             elif k == "lon_acc_index":
@@ -65,15 +92,26 @@ class TripMD(object):
 
     def sample_trip_list(self, sample_size):
         window_size = self._default_letter_size * self._min_word_size
-        sample_obs_list = []
+        sample_trip_indices = np.zeros(sample_size, dtype=int)
+        sample_pointers = np.zeros(sample_size, dtype=int)
         for i in range(sample_size):
-            sample_trip = random.choice(self._trip_list)
-            sample_trip_size = sample_trip.get_trip_size()
-            sample_pointer = random.randrange(0, sample_trip_size - window_size)
-            sample_window = list(range(sample_pointer, sample_pointer + window_size))
-            sample_obs = sample_trip.get_windown_obs(sample_window)
-            sample_obs_list.append(sample_obs)
-        return sample_obs_list
+            sample_trip_index = random.randrange(len(self._trip_list))
+            sample_trip_size = self._trip_list[sample_trip_index].get_trip_size()
+            sample_trip_indices[i] = sample_trip_index
+            sample_pointers[i] = random.randrange(0, sample_trip_size - window_size)
+        # extract the sampled windows of each trip in a single batch
+        sample_obs_array = None
+        for trip_index in np.unique(sample_trip_indices):
+            sample_indices = np.flatnonzero(sample_trip_indices == trip_index)
+            trip_windows = self._trip_list[trip_index].get_strided_windows(
+                sample_pointers[sample_indices], window_size
+            )
+            if sample_obs_array is None:
+                sample_obs_array = np.empty(
+                    (sample_size,) + trip_windows.shape[1:], dtype=trip_windows.dtype
+                )
+            sample_obs_array[sample_indices] = trip_windows
+        return sample_obs_array
 
     def run_pipeline(self, checkpoint=True):
         motif_list = self.run_motif_extraction(checkpoint)
@@ -90,6 +128,15 @@ class TripMD(object):
             self._min_word_size,
             self._max_radius,
             self._compute_mdl,
+            self._motif_engine,
+            self._count_sketch_width,
+            self._n_jobs,
+            self._max_memory,
+            self._n_threads,
+            self._pivot_pruning,
+            self._n_pivots,
+            self._medoid_threshold,
+            self._medoid_sample_size,
         )
         if checkpoint:
             Path(self._output_folder).mkdir(parents=True, exist_ok=True)
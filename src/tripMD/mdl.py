@@ -1,4 +1,5 @@
 import math
+import itertools
 from tripMD.dtwdist import compute_ndim_dwt_dist_between_ts_and_list
 
 
@@ -23,6 +24,47 @@ def compute_mdl_cost(members_word_list, trip_word_list):
     return mdl_cost
 
 
+def compute_mdl_cost_from_sequence(members_word_list, vsax_sequence):
+    """
+    This function computes the same MDL cost as `compute_mdl_cost`, but the lengths of all the words are read from the
+    letters of the vsax sequence instead of a list with all the words. Thus, the members must have been read from a word
+    table of vsax_sequence, so that they know their index in the list of all words (see `VSaxWord.get_word_index`).
+
+    Args:
+        members_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): List of all the vsax words that make up the
+        motif.
+        vsax_sequence (tripMD.vsax.objects.vsax_sequence.VSaxSequence): vsax sequence from which the motif was
+        extracted.
+
+    Returns:
+        mdl_cost (float): MDL cost of the given motif.
+    """
+    word_size = len(members_word_list[0].get_word_lengths())
+    n_words = vsax_sequence.get_n_words(word_size)
+    split_word_lengths_list = []
+    previous_index = 0
+    for member in members_word_list:
+        member_index = member.get_word_index()
+        if member_index is None:
+            raise Exception(
+                "The index of the word is unknown. Make sure the motif's members were read from a VSaxWordTable"
+            )
+        if member_index > 0:
+            next_segment_lengths = vsax_sequence.get_flat_word_lengths(
+                word_size, previous_index, member_index
+            )
+            split_word_lengths_list.append(next_segment_lengths)
+        split_word_lengths_list.append(member.get_word_lengths())
+        previous_index = member_index
+    if previous_index < n_words:
+        next_segment_lengths = vsax_sequence.get_flat_word_lengths(
+            word_size, previous_index, n_words
+        )
+        split_word_lengths_list.append(next_segment_lengths)
+    mdl_cost = _compute_mdl_cost_of_split_list(split_word_lengths_list)
+    return mdl_cost
+
+
 def prune_motifs(trip_list, motif_list, max_radius):
     """
     This function prunes the set of all extracted motifs based on the MDL cost and the distance of the centers. In short,
@@ -77,21 +119,33 @@ def _compute_split_word_lengths_list(members_word_list, trip_word_list):
     for member in members_word_list:
         member_index = _find_word_index_in_list(member, trip_word_list)
         if member_index > 0:
-            next_segment_lengths = sum(
-                trip_word_lengths[previous_index:member_index], []
+            next_segment_lengths = _flatten(
+                trip_word_lengths[previous_index:member_index]
             )
             split_word_lengths_list.append(next_segment_lengths)
         member_length = trip_word_lengths[member_index]
         split_word_lengths_list.append(member_length)
         previous_index = member_index
     if previous_index < len(trip_word_lengths):
-        next_segment_lengths = sum(trip_word_lengths[previous_index:], [])
+        next_segment_lengths = _flatten(trip_word_lengths[previous_index:])
         split_word_lengths_list.append(next_segment_lengths)
     return split_word_lengths_list
 
 
+def _flatten(list_of_lists):
+    return list(itertools.chain.from_iterable(list_of_lists))
+
+
 def _find_word_index_in_list(word, word_list):
     word_trip_id = word.get_trip_index()
+    # words read from a word table know their index, which only needs to be checked
+    word_index = word.get_word_index()
+    if word_index is not None and word_index < len(word_list):
+        candidate_word = word_list[word_index]
+        if (candidate_word.get_trip_index() == word_trip_id) and (
+            candidate_word.get_bounds() == word.get_bounds()
+        ):
+            return word_index
     word_pointers = word.get_pointers()
     for index, candidate_word in enumerate(word_list):
         candidate_trip_id = candidate_word.get_trip_index()
@@ -125,7 +179,7 @@ def _compute_mdl_cost_of_split_list(split_word_lengths_list):
     par_cost = sum(par_cost_list)
     data_cost = sum(data_cost_list)
     split_cost = len(split_word_lengths_list) * math.log2(
-        sum(sum(split_word_lengths_list, []))
+        sum(_flatten(split_word_lengths_list))
     )
     mdl_cost = round(par_cost + data_cost + split_cost, 2)
     return mdl_cost
@@ -0,0 +1,114 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# bytes of the work arrays of the member selection, per neighbor of a block of rows
+MEMBER_BYTES_PER_NEIGHBOR = 48
+
+
+def select_members(indptr, indices, dists, starts, ends, max_memory=None):
+    """
+    This function selects the members of a motif for every candidate to center at once. The candidates' neighbors
+    (i.e. the words within max_radius) are given in the CSR format of `tripMD.dtwdist.compute_ndim_dtw_neighbors` and,
+    for each candidate, they are pruned as in the original member selection: the neighbors are walked in increasing
+    order and, when a neighbor overlaps the last selected member, only the one closest to the candidate is kept (the
+    last member is replaced only if the neighbor is strictly closer). Two words overlap if they share any observation
+    pointer, regardless of their trip. Since the pointers of a word are a contiguous range, this is an interval
+    comparison of the words' bounds.
+
+    The rows where no two consecutive neighbors overlap keep all their neighbors, which is checked for all rows at
+    once. The remaining rows are walked by a compiled kernel when numba is installed, and by a python loop otherwise.
+    When max_memory is set, the rows are processed in blocks whose work arrays fit it, so that indices and dists can be
+    memory-mapped files that are never fully read into memory (only the one byte per neighbor of the result is).
+
+    Args:
+        indptr (numpy.array): the neighbors of the i-th candidate are in positions indptr[i] to indptr[i + 1] of indices
+        and dists.
+        indices (numpy.array): index of each neighbor, in increasing order inside each candidate.
+        dists (numpy.array): DTW distance of each neighbor to its candidate.
+        starts (numpy.array): pointer to the first observation of each word.
+        ends (numpy.array): pointer to the observation right after the last one of each word.
+        max_memory (int): approximate ceiling, in bytes, of the memory used by the work arrays. It defaults to None, in
+        which case all the rows are processed at once.
+
+    Returns:
+        is_member (numpy.array): boolean array, aligned with indices, which is True for the selected members.
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    is_member = np.ones(indptr[-1], dtype=bool)
+    for first_row, last_row in _get_row_blocks(indptr, max_memory):
+        positions = slice(indptr[first_row], indptr[last_row])
+        is_member[positions] = _select_members_in_block(
+            indptr[first_row : last_row + 1] - indptr[first_row],
+            np.asarray(indices[positions], dtype=np.int64),
+            np.asarray(dists[positions], dtype=np.float64),
+            starts,
+            ends,
+        )
+    return is_member
+
+
+def _get_row_blocks(indptr, max_memory):
+    n_rows = len(indptr) - 1
+    if max_memory is None:
+        return [(0, n_rows)]
+    max_block_size = max(int(max_memory // MEMBER_BYTES_PER_NEIGHBOR), 1)
+    row_blocks = []
+    first_row = 0
+    while first_row < n_rows:
+        # the block ends at the last row that keeps it within max_block_size neighbors, but it has at least one row
+        max_end = indptr[first_row] + max_block_size
+        last_row = int(np.searchsorted(indptr, max_end, side="right")) - 1
+        last_row = min(max(last_row, first_row + 1), n_rows)
+        row_blocks.append((first_row, last_row))
+        first_row = last_row
+    return row_blocks
+
+
+def _select_members_in_block(indptr, indices, dists, starts, ends):
+    is_member = np.ones(len(indices), dtype=bool)
+    if len(indices) < 2:
+        return is_member
+    # overlap of each neighbor with the previous one in the same row
+    is_row_start = np.zeros(len(indices), dtype=bool)
+    is_row_start[indptr[:-1][indptr[:-1] < len(indices)]] = True
+    overlaps_previous = np.zeros(len(indices), dtype=bool)
+    overlaps_previous[1:] = (starts[indices[1:]] < ends[indices[:-1]]) & (
+        starts[indices[:-1]] < ends[indices[1:]]
+    )
+    overlaps_previous[is_row_start] = False
+    row_has_overlap = np.add.reduceat(overlaps_previous, indptr[:-1]) > 0
+    row_has_overlap[np.diff(indptr) == 0] = False
+    overlap_rows = np.flatnonzero(row_has_overlap)
+    if len(overlap_rows) > 0:
+        _select_members_in_rows(
+            overlap_rows, indptr, indices, dists, starts, ends, is_member
+        )
+    return is_member
+
+
+def _select_members_in_rows(rows, indptr, indices, dists, starts, ends, is_member):
+    for row in rows:
+        last_member = indptr[row]
+        for position in range(indptr[row] + 1, indptr[row + 1]):
+            member = indices[position]
+            last_index = indices[last_member]
+            if (starts[member] < ends[last_index]) and (
+                starts[last_index] < ends[member]
+            ):
+                if dists[position] < dists[last_member]:
+                    is_member[last_member] = False
+                    last_member = position
+                else:
+                    is_member[position] = False
+            else:
+                last_member = position
+
+
+if njit is not None:
+    _select_members_in_rows = njit(cache=True)(_select_members_in_rows)
@@ -1,6 +1,11 @@
 import numpy as np
-from tripMD.dtwdist import compute_ndim_dtw_dist_mat
-from tripMD.mdl import compute_mdl_cost
+from tripMD.dtwdist import (
+    compute_ndim_dtw_neighbors,
+    DTWPivotIndex,
+    DTWMedoidSampler,
+)
+from tripMD.mdl import compute_mdl_cost, compute_mdl_cost_from_sequence
+from tripMD.member_selection import select_members
 
 
 class Motif:
@@ -11,51 +16,108 @@ class Motif:
     string pattern.
 
     Args:
-        pattern (tuple of str): String representation of the motif. All vsax words that belong to the motif will
-        same this pattern as their string representation.
+        pattern (tuple of int): Integer representation of the motif (see `VSaxWord.get_pattern`). All vsax words that
+        belong to the motif will same this pattern.
         max_radius (float): maximum distance of all members to the center of the motif. If a vsax word with the same
         string representation as the motif's pattern has a DTW distance to the center higher than max_radius, then it
         won't be included as a member of the motif.
         compute_mdl (bool): boolean indicating whether the user wants to compute the MDL cost of the motif.
 
     Attributes:
-        pattern (tuple of str): String representation of the motif. All vsax words that belong to the motif will
-        same this pattern as their string representation.
+        pattern (tuple of int): Integer representation of the motif (see `VSaxWord.get_pattern`). All vsax words that
+        belong to the motif will same this pattern.
+        str_pattern (tuple of str): String representation of the motif, decoded from pattern when the center and members
+        are computed.
         max_radius (float): maximum distance of all members to the center of the motif. If a vsax word with the same
         string representation as the motif's pattern has a distance to the center higher than max_radius, then it
         won't be included as a member of the motif.
         compute_mdl (bool): boolean indicating whether the user wants to compute the MDL cost of the motif.
+        max_memory (int): approximate ceiling, in bytes, of the memory used to compute the DTW distances between the
+        candidates.
+        n_threads (int): number of threads that compute the DTW distances between the candidates.
+        pivot_pruning (bool): whether the candidates to center are pruned with pivots, which is approximate.
+        n_pivots (int): number of pivots of the pivot pruning.
+        medoid_threshold (int): number of candidates above which the center is searched by sampling.
+        medoid_sample_size (int): number of sampled candidates (and of references in each batch) of the sampling search.
         center (tripMD.vsax.objects.vsax_word.VSaxWord): vsax word at the center of the motif. It is the representative
         word of the motif.
         members (list of tripMD.vsax.objects.vsax_word.VSaxWord): List of all the vsax words that make up the motif.
         mean_dist (float): average of the DTW distances of all motif's members to the motif's center.
+        center_confidence (float): confidence in the center. It is 1 for the exact search, where the center is the best
+        one, and None for the pivot pruning, which has no probabilistic guarantee. For the sampling search, it is a lower
+        bound of the probability that the center is at least as good as a candidate in the top
+        `tripMD.dtwdist.MEDOID_QUANTILE` fraction of all the candidates by number of words within max_radius, which
+        accounts for the candidates that were not sampled (see `tripMD.dtwdist.DTWMedoidSampler.get_confidence`). It
+        is 1 only when all the candidates were sampled and compared with all the words.
         mdl (float): Minimum description length cost of the motif (computed as defined by Tanaka et all).
         description (dict): User provided description for the motif. It defaults to None and must be defined through the
         function `add_description` .
     """
 
-    def __init__(self, pattern, max_radius, compute_mdl):
+    def __init__(
+        self,
+        pattern,
+        max_radius,
+        compute_mdl,
+        str_pattern=None,
+        max_memory=None,
+        n_threads=1,
+        pivot_pruning=False,
+        n_pivots=8,
+        medoid_threshold=None,
+        medoid_sample_size=100,
+    ):
         """
         Constructor of the Motif class
 
         Args:
-            pattern (tuple of str): String representation of the motif. All vsax words that belong to the motif will
-            same this pattern as their string representation.
+            pattern (tuple of int): Integer representation of the motif (see `VSaxWord.get_pattern`). All vsax words
+            that belong to the motif will same this pattern.
             max_radius (float): maximum distance of all members to the center of the motif. If a vsax word with the same
             string representation as the motif's pattern has a distance to the center higher than max_radius, then it
             won't be included as a member of the motif.
             compute_mdl (bool): boolean indicating whether the user wants to compute the MDL cost of the motif.
+            str_pattern (tuple of str): String representation of the motif. It defaults to None, in which case it is
+            decoded from pattern when the center and members are computed.
+            max_memory (int): approximate ceiling, in bytes, of the memory used to compute the DTW distances between
+            the candidates. It defaults to None, in which case there is no ceiling (see
+            `tripMD.dtwdist.compute_ndim_dtw_neighbors`).
+            n_threads (int): number of threads that compute the DTW distances between the candidates.
+            pivot_pruning (bool): whether the candidates to center are pruned with the triangle inequality on the
+            distances to a few pivots (see `tripMD.dtwdist.DTWPivotIndex`), so that only the neighbors of the
+            candidates that can still beat the best one are computed. The members of the center are always exact (all
+            the words within max_radius of it, with exact distances, selected as without pivots), but DTW does not
+            satisfy the triangle inequality, so the bounds are approximate and, when it does not hold among the
+            candidates, a better center may be skipped. It defaults to False.
+            n_pivots (int): number of pivots of the pivot pruning.
+            medoid_threshold (int): number of candidates above which the center is searched by sampling (see
+            `tripMD.dtwdist.DTWMedoidSampler`): a sample of medoid_sample_size candidates is compared with batches of
+            sampled words, only the ones with the highest fractions of words within max_radius are refined with their
+            exact neighbors, and the best of those is the center. Its members are exact, but a better center may be
+            missed, so the confidence is reported in the center_confidence attribute. It defaults to None, in which
+            case the sampling search is never used.
+            medoid_sample_size (int): number of sampled candidates (and of words in each batch) of the sampling search.
         """
         self.pattern = pattern
+        self.str_pattern = str_pattern
         self.max_radius = max_radius
         self.compute_mdl = compute_mdl
+        self.max_memory = max_memory
+        self.n_threads = n_threads
+        self.pivot_pruning = pivot_pruning
+        self.n_pivots = n_pivots
+        self.medoid_threshold = medoid_threshold
+        self.medoid_sample_size = medoid_sample_size
         self.center = None
         self.members = None
         self.mean_dist = np.inf
+        self.center_confidence = None
         self.mdl = None
         self.description = None
 
-    def compute_center_and_members(self, vsax_sequence, word_list):
+    def compute_center_and_members(
+        self, vsax_sequence, word_list, candidate_rows=None
+    ):
         """
         Computation of the center and members of the motif that the provided pattern and max_radius. It does not return
         the final center and members. Instead it updates the corresponding attributes of the object (center, members,
@@ -64,18 +126,134 @@ class Motif:
         Args:
             vsax_sequence (tripMD.vsax.objects.vsax_sequence.VSaxSequence): vsax sequence with the trips from which we
             are extracting the motif
-            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): Full list of words (which were extracted from
-            the trips under analysis) from where we'll look for the motif's center and members.
+            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of words (which were extracted from the
+            trips under analysis) from where we'll look for the motif's center and members. It must include all the
+            words with the motif's pattern, but the other words may be left out if they were read from a word table of
+            vsax_sequence (see `VSaxSequence.get_word_table`).
+            candidate_rows (list of int): indices of the words in word_list with the motif's pattern, in increasing
+            order (e.g., taken from `VSaxWordTable.get_pattern_rows`). It defaults to None, in which case word_list is
+            scanned for them.
         """
-        candidate_word_list = self._get_candidates(word_list)
-        dtw_dist_mat = self._compute_dtw_distance_matrix(
-            vsax_sequence, candidate_word_list
+        if self.str_pattern is None:
+            self.str_pattern = vsax_sequence.decode_pattern(self.pattern)
+        if candidate_rows is None:
+            candidate_word_list = self._get_candidates(word_list)
+        else:
+            candidate_word_list = self.slice_list(word_list, candidate_rows)
+        self.compute_center_and_members_from_candidates(
+            vsax_sequence.trip_list, candidate_word_list
         )
+        if self.compute_mdl:
+            self.update_mdl_cost(vsax_sequence, word_list)
+
+    def compute_center_and_members_from_candidates(
+        self, trip_list, candidate_word_list, parallel=True
+    ):
+        """
+        Computation of the center and members of the motif from the list of all the words with the motif's pattern. It
+        updates the center, members and mean_dist attributes, but not the MDL cost (see `update_mdl_cost`), so it only
+        needs the trips and it can run in a different process.
+
+        Args:
+            trip_list (list of tripMD.objects.trip.Trip): list of original trips from which the words were extracted.
+            It can also be a tripMD.objects.trip_store.TripStore.
+            candidate_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of all the words with the
+            motif's pattern.
+            parallel (bool): whether the DTW distances are computed in parallel.
+        """
+        # the search only replaces the center with better ones, so it starts from scratch when the motif is recomputed
+        self.center = None
+        self.members = None
+        self.mean_dist = np.inf
+        self.center_confidence = None
+        if len(candidate_word_list) == 0:
+            return
+        ts_list = self._get_ts_list(trip_list, candidate_word_list)
+        word_bounds = np.array(
+            [word.get_bounds() for word in candidate_word_list], dtype=np.int64
+        )
+        if (self.medoid_threshold is not None) and (
+            len(candidate_word_list) > self.medoid_threshold
+        ):
+            self._search_center_with_sampling(
+                ts_list, candidate_word_list, word_bounds, parallel
+            )
+            return
+        if self.pivot_pruning and (len(candidate_word_list) > self.n_pivots):
+            self._search_center_with_pivots(
+                ts_list, candidate_word_list, word_bounds, parallel
+            )
+            return
+        indptr, neighbor_index, neighbor_dist = compute_ndim_dtw_neighbors(
+            ts_list, self.max_radius, parallel, self.max_memory, self.n_threads
+        )
+        # the members of all the candidates are selected in a single call
+        is_member = select_members(
+            indptr,
+            neighbor_index,
+            neighbor_dist,
+            word_bounds[:, 0],
+            word_bounds[:, 1],
+            self.max_memory,
+        )
+        neighbor_counts = np.diff(indptr)
+        # every candidate is its own neighbor, so no row is empty
+        members_counts = np.add.reduceat(is_member, indptr[:-1], dtype=np.int64)
+        # the center is the candidate with most members and, among those, with the lowest mean distance. Ties in both
+        # go to the first candidate
+        members_count = members_counts.max()
+        for candidate_index in np.flatnonzero(members_counts == members_count).tolist():
+            row = slice(indptr[candidate_index], indptr[candidate_index + 1])
+            if neighbor_counts[candidate_index] == 1:
+                candidate_mean_dist = 0
+            else:
+                candidate_mean_dist = np.mean(neighbor_dist[row][is_member[row]])
+            if candidate_mean_dist < self.mean_dist:
+                self.center = candidate_word_list[candidate_index]
+                self.members = self.slice_list(
+                    candidate_word_list, neighbor_index[row][is_member[row]]
+                )
+                self.mean_dist = candidate_mean_dist
+        self.center_confidence = 1.0
+
+    def _search_center_with_sampling(
+        self, ts_list, candidate_word_list, word_bounds, parallel
+    ):
+        """
+        Search of the motif's center by sampling (see `Motif.__init__`). It updates the center, members, mean_dist and
+        center_confidence attributes.
+
+        Args:
+            ts_list (list of numpy.array): list with the observations of each candidate.
+            candidate_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of all the words with the
+            motif's pattern.
+            word_bounds (numpy.array): array of shape (n_candidates, 2) with the bounds of each candidate.
+            parallel (bool): whether the DTW distances are computed in parallel.
+        """
+        sampler = DTWMedoidSampler(
+            ts_list, self.max_radius, self.medoid_sample_size, parallel=parallel
+        )
+        try:
+            self._search_center_in_sampler(sampler, candidate_word_list, word_bounds)
+        finally:
+            sampler.close()
+
+    def _search_center_in_sampler(self, sampler, candidate_word_list, word_bounds):
+        """
+        Refinement of the contenders of the sampling search (see `_search_center_with_sampling`).
+
+        Args:
+            sampler (tripMD.dtwdist.DTWMedoidSampler): sampler of the candidates.
+            candidate_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of all the words with the
+            motif's pattern.
+            word_bounds (numpy.array): array of shape (n_candidates, 2) with the bounds of each candidate.
+        """
         members_count = 0
-        for candidate_index in range(len(candidate_word_list)):
-            candidate_center = candidate_word_list[candidate_index]
+        center_index = None
+        for candidate_index in sampler.contenders.tolist():
+            neighbor_index, neighbor_dist = sampler.get_neighbors(candidate_index)
             candidate_members, candidate_mean_dist = self._compute_members_and_mean_dist(
-                candidate_index, dtw_dist_mat, candidate_word_list
+                neighbor_index, neighbor_dist, candidate_word_list, word_bounds
             )
             candidate_members_count = len(candidate_members)
             if (candidate_members_count > members_count) or (
@@ -83,12 +261,97 @@ class Motif:
                 and (candidate_mean_dist < self.mean_dist)
             ):
                 members_count = candidate_members_count
-                self.center = candidate_center
+                center_index = candidate_index
+                self.center = candidate_word_list[candidate_index]
                 self.members = candidate_members
                 self.mean_dist = candidate_mean_dist
             else:
                 continue
-        if self.compute_mdl:
+        self.center_confidence = sampler.get_confidence(center_index)
+
+    def _search_center_with_pivots(
+        self, ts_list, candidate_word_list, word_bounds, parallel
+    ):
+        """
+        Search of the motif's center with the pivot pruning (see `Motif.__init__`). It updates the center, members and
+        mean_dist attributes.
+
+        Args:
+            ts_list (list of numpy.array): list with the observations of each candidate.
+            candidate_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of all the words with the
+            motif's pattern.
+            word_bounds (numpy.array): array of shape (n_candidates, 2) with the bounds of each candidate.
+            parallel (bool): whether the DTW distances are computed in parallel.
+        """
+        pivot_index = DTWPivotIndex(ts_list, self.max_radius, self.n_pivots, parallel)
+        try:
+            self._search_center_in_pivot_index(
+                pivot_index, candidate_word_list, word_bounds
+            )
+        finally:
+            pivot_index.close()
+
+    def _search_center_in_pivot_index(
+        self, pivot_index, candidate_word_list, word_bounds
+    ):
+        """
+        Loop of the pivot pruning over the candidates, in decreasing order of their bounds (see
+        `_search_center_with_pivots`).
+
+        Args:
+            pivot_index (tripMD.dtwdist.DTWPivotIndex): pivot index of the candidates.
+            candidate_word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of all the words with the
+            motif's pattern.
+            word_bounds (numpy.array): array of shape (n_candidates, 2) with the bounds of each candidate.
+        """
+        count_upper_bounds = pivot_index.count_upper_bounds
+        # the candidates are evaluated from the highest bound down, so the search stops as soon as the bound of the
+        # next candidate is lower than the best number of members
+        candidate_order = np.argsort(-count_upper_bounds, kind="stable")
+        members_count = 0
+        center_index = None
+        for candidate_index in candidate_order.tolist():
+            if count_upper_bounds[candidate_index] < members_count:
+                break
+            neighbor_index, neighbor_dist = pivot_index.get_neighbors(candidate_index)
+            candidate_members, candidate_mean_dist = self._compute_members_and_mean_dist(
+                neighbor_index, neighbor_dist, candidate_word_list, word_bounds
+            )
+            candidate_members_count = len(candidate_members)
+            # ties in both the number of members and the mean distance go to the first candidate, as if they were
+            # evaluated in their original order
+            if (candidate_members_count > members_count) or (
+                (candidate_members_count == members_count)
+                and (
+                    (candidate_mean_dist < self.mean_dist)
+                    or (
+                        (candidate_mean_dist == self.mean_dist)
+                        and (candidate_index < center_index)
+                    )
+                )
+            ):
+                members_count = candidate_members_count
+                center_index = candidate_index
+                self.center = candidate_word_list[candidate_index]
+                self.members = candidate_members
+                self.mean_dist = candidate_mean_dist
+            else:
+                continue
+
+    def update_mdl_cost(self, vsax_sequence, word_list):
+        """
+        Computation of the MDL cost of the motif, once its members are computed. It updates the mdl attribute.
+
+        Args:
+            vsax_sequence (tripMD.vsax.objects.vsax_sequence.VSaxSequence): vsax sequence with the trips from which we
+            are extracting the motif
+            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of words from where the motif's members
+            were taken. It is only used when the members were not read from a word table of vsax_sequence, in which case
+            it must include all the words of the same size.
+        """
+        if all(member.get_word_index() is not None for member in self.members):
+            self.mdl = compute_mdl_cost_from_sequence(self.members, vsax_sequence)
+        else:
             self.mdl = compute_mdl_cost(self.members, word_list)
 
     def add_description(self, description):
@@ -127,11 +390,19 @@ class Motif:
     def get_pattern(self):
         """
         Returns:
-            pattern (tuple of str): String representation of the motif. All vsax words that belong to the motif will
-            same this pattern as their string representation.
+            pattern (tuple of int): Integer representation of the motif (see `VSaxWord.get_pattern`). All vsax words
+            that belong to the motif will same this pattern.
         """
         return self.pattern
 
+    def get_str_pattern(self):
+        """
+        Returns:
+            str_pattern (tuple of str): String representation of the motif. All vsax words that belong to the motif
+            will same this pattern as their string representation.
+        """
+        return self.str_pattern
+
     def get_mean_distance(self):
         """
         Returns:
@@ -139,6 +410,13 @@ class Motif:
         """
         return self.mean_dist
 
+    def get_center_confidence(self):
+        """
+        Returns:
+            center_confidence (float): confidence in the motif's center (see the center_confidence attribute).
+        """
+        return self.center_confidence
+
     def get_mdl_cost(self):
         """
         Returns:
@@ -147,7 +425,7 @@ class Motif:
         return self.mdl
 
     def print_summary(self):
-        print("Pattern: " + str(self.pattern))
+        print("Pattern: " + str(self.str_pattern))
         print("Num of members: " + str(len(self.members)))
         print("Center size: " + str(len(self.center.get_pointers())))
         print("Mean distance: " + str(round(self.mean_dist, 4)))
@@ -160,7 +438,8 @@ class Motif:
             trip_list (list of tripMD.objects.trip.Trip): list of original trips from which the motif was extracted
 
         Returns:
-            member_obs_list (list):
+            member_obs_list (list of numpy.array): list with a view of shape (member size, n_dim) with the
+            observations of each member.
         """
         member_obs_list = []
         if self.members is None:
@@ -169,7 +448,7 @@ class Motif:
             member_pointers = member.get_pointers()
             member_trip_index = member.get_trip_index()
             member_trip = trip_list[member_trip_index]
-            member_obs = member_trip.get_windown_obs(member_pointers)
+            member_obs = member_trip.get_pointers_view(member_pointers)
             member_obs_list.append(member_obs)
         return member_obs_list
 
@@ -180,7 +459,7 @@ class Motif:
             trip_list (list of tripMD.objects.trip.Trip): list of original trips from which the motif was extracted
 
         Returns:
-            center_obs (list numpy.array):
+            center_obs (numpy.array): view of shape (center size, n_dim) with the center's observations.
 
         """
         if self.center is None:
@@ -188,7 +467,7 @@ class Motif:
         center_pointers = self.center.get_pointers()
         center_trip_index = self.center.get_trip_index()
         center_trip = trip_list[center_trip_index]
-        center_obs = center_trip.get_windown_obs(center_pointers)
+        center_obs = center_trip.get_pointers_view(center_pointers)
         return center_obs
 
     def get_members_labels_list(self, trip_list, label_index=0):
@@ -217,73 +496,61 @@ class Motif:
             word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): Full list of vsax words
 
         Returns:
-            candidate_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): List of vsax words with the same string
-            representation as the motif's pattern
+            candidate_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): List of vsax words with the same pattern
+            as the motif
 
         """
         candidate_list = []
         for vsax_word in word_list:
-            if vsax_word.get_str_rep() == self.pattern:
+            if vsax_word.get_pattern() == self.pattern:
                 candidate_list.append(vsax_word)
         return candidate_list
 
-    def _compute_dtw_distance_matrix(self, vsax_sequence, word_list):
+    @staticmethod
+    def _get_ts_list(trip_list, word_list):
         """
         Args:
-            vsax_sequence (tripMD.vsax.objects.vsax_sequence.VSaxSequence): vsax sequence with the trips from which we
-            are extracting the motif
-            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of vsax words from which we wish to compute
-            the pairwise DTW distances.
+            trip_list (list of tripMD.objects.trip.Trip): list of original trips from which the words were extracted.
+            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of vsax words.
 
         Returns:
-            dist_mat (numpy.array): matrix with the pairwise DTW distances of word_list.
+            ts_list (list of numpy.array): list with the observations of each word.
         """
-        ts_list = [vsax_sequence.get_word_obs(word) for word in word_list]
-        dist_mat = compute_ndim_dtw_dist_mat(ts_list, self.max_radius)
-        return dist_mat
-
-    def _compute_members_and_mean_dist(self, center_index, dtw_dist_mat, word_list):
+        ts_list = []
+        for word in word_list:
+            start, end = word.get_bounds()
+            ts_list.append(trip_list[word.get_trip_index()].get_window_view(start, end))
+        return ts_list
+
+    def _compute_members_and_mean_dist(
+        self, neighbor_index, neighbor_dist, word_list, word_bounds
+    ):
         """
         Args:
-            center_index (int): index of the candidate to motif's center in in word_list.
-            dtw_dist_mat (numpy.array): matrix with the pairwise DTW distances of word_list.
-            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of vsax words from which we computed the
-            dtw_dist_mat and from where we will look for the motif's members, assuming the given center.
+            neighbor_index (numpy.array): indices of the words in word_list whose DTW distance to the candidate to
+            motif's center is lower than max_radius, in increasing order.
+            neighbor_dist (numpy.array): DTW distances of those words to the candidate to motif's center.
+            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list of vsax words from where we will look for
+            the motif's members, assuming the given center.
+            word_bounds (numpy.array): array of shape (len(word_list), 2) with the bounds of each word.
 
         Returns:
             final_members (list of tripMD.vsax.objects.vsax_word.VSaxWord): List with the member of the motif, assuming
             the given center.
             mean_dist (float): average of the DTW distances of all the members to the given center.
         """
-        center_dist_vec = dtw_dist_mat[center_index]
-        unpruned_members_index = [
-            i for i, dist in enumerate(center_dist_vec) if dist < self.max_radius
-        ]
-        if len(unpruned_members_index) == 1:
-            final_members = self.slice_list(word_list, unpruned_members_index)
+        is_member = select_members(
+            [0, len(neighbor_index)],
+            neighbor_index,
+            neighbor_dist,
+            word_bounds[:, 0],
+            word_bounds[:, 1],
+        )
+        final_members = self.slice_list(word_list, neighbor_index[is_member])
+        if len(neighbor_index) == 1:
             mean_dist = 0
         else:
-            pruned_members_index = [unpruned_members_index[0]]
-            for member_index in unpruned_members_index[1:]:
-                member = word_list[member_index]
-                last_pruned_member_index = pruned_members_index[-1]
-                last_pruned_member = word_list[last_pruned_member_index]
-                if self.lists_overlap(
-                    last_pruned_member.get_pointers(), member.get_pointers()
-                ):
-                    last_pruned_member_dist = center_dist_vec[
-                        last_pruned_member_index
-                    ]
-                    member_dist = center_dist_vec[member_index]
-                    if member_dist < last_pruned_member_dist:
-                        pruned_members_index = pruned_members_index[:-1]
-                        pruned_members_index.append(member_index)
-                    else:
-                        continue
-                else:
-                    pruned_members_index.append(member_index)
-            final_members = self.slice_list(word_list, pruned_members_index)
-            mean_dist = np.mean(center_dist_vec[pruned_members_index])
+            mean_dist = np.mean(neighbor_dist[is_member])
         return final_members, mean_dist
 
     @staticmethod
@@ -19,7 +19,11 @@ class Trip(object):
     Attributes:
         n_dim (int): dimension of the trip (i.e. number fo signals)
         id (str): ID for the trip
-        signals (list of numpy.array): list with the trip data. Each item of the list is a 1-dimensional array
+        obs_array (numpy.array): contiguous 2-dimensional array of shape (n_obs, n_dim) with the trip data. Each row is
+        a single multidimensional observation and each column is a signal. Windows taken from this array are views that
+        can be passed directly to `dtaidistance.dtw_ndim`.
+        signals (list of numpy.array): list with the trip data. Each item of the list is a 1-dimensional array (a column
+        view of obs_array). Assigning the whole list or one of its items writes the new signals into obs_array
         labels (list of list): List of labels related to the each time-series observation
         timestamps (list of float): list with the timestamp of each observation
         representing a single signal or measurement of that trip
@@ -45,7 +49,7 @@ class Trip(object):
             )
         self.n_obs = n_obs_list[0]
         self.id = trip_id
-        self.signals = signal_list
+        self.obs_array = np.ascontiguousarray(np.column_stack(signal_list))
         self.n_dim = len(signal_list)
         self.labels = labels_list
         if labels_list is not None:
@@ -66,6 +70,94 @@ class Trip(object):
             else:
                 self.timestamps = timestamps
 
+    @property
+    def signals(self):
+        """
+        Returns:
+            signals (list of numpy.array): list with the trip data. Each item of the list is a 1-dimensional column view
+            of obs_array representing a single signal or measurement of that trip.
+        """
+        return _SignalList(self)
+
+    @signals.setter
+    def signals(self, signal_list):
+        if any(len(signal) != self.n_obs for signal in signal_list):
+            raise Exception(
+                "The size of the signals is inconsistent with the trip size. "
+                "Make sure all signals have the same number of observations as the trip"
+            )
+        self.obs_array = np.ascontiguousarray(np.column_stack(signal_list))
+        self.n_dim = len(signal_list)
+
+    def get_obs_array(self):
+        """
+        Returns:
+            obs_array (numpy.array): 2-dimensional array of shape (n_obs, n_dim) with all the trip's observations.
+        """
+        return self.obs_array
+
+    def get_window_view(self, start, end):
+        """
+        Args:
+            start (int): pointer to the first observation of the window.
+            end (int): pointer to the observation right after the last one of the window (exclusive).
+
+        Returns:
+            window_view (numpy.array): view (no copy) of shape (end - start, n_dim) with the multidimensional
+            observations of the window. It can be used directly as a time-series in `dtaidistance.dtw_ndim`.
+        """
+        return self.obs_array[start:end]
+
+    def get_strided_windows(self, starts, length):
+        """
+        Args:
+            starts (numpy.array): array of int with the pointer to the first observation of each window.
+            length (int): number of observations in each window.
+
+        Returns:
+            windows (numpy.array): read-only array of shape (len(starts), length, n_dim) with the multidimensional
+            observations of all the windows. It is built with stride tricks over obs_array, so when `starts` is a
+            contiguous range (e.g., all sliding windows of the trip) no data is copied.
+        """
+        starts = np.asarray(starts, dtype=np.intp)
+        n_windows = self.n_obs - length + 1
+        if len(starts) > 0 and (starts.min() < 0 or starts.max() >= n_windows):
+            raise IndexError("The provided windows are out of the trip's range")
+        row_stride, col_stride = self.obs_array.strides
+        all_windows = np.lib.stride_tricks.as_strided(
+            self.obs_array,
+            shape=(max(n_windows, 0), length, self.n_dim),
+            strides=(row_stride, row_stride, col_stride),
+            writeable=False,
+        )
+        if len(starts) > 0 and np.all(np.diff(starts) == 1):
+            return all_windows[starts[0] : starts[0] + len(starts)]
+        else:
+            return all_windows[starts]
+
+    def get_pointers_view(self, pointers):
+        """
+        Args:
+            pointers (list of int): pointers to the trip, indicating the place from which we want to take the
+            observations.
+
+        Returns:
+            window_obs (numpy.array): array of shape (len(pointers), n_dim) with the multidimensional observations. When
+            the pointers form a contiguous range (which is always the case for vsax letters and words) the result is a
+            view of obs_array, otherwise it is a copy.
+        """
+        n_pointers = len(pointers)
+        if n_pointers == 0:
+            return self.obs_array[0:0]
+        start = pointers[0]
+        end = pointers[-1] + 1
+        if end - start == n_pointers and (
+            n_pointers < 3 or np.all(np.diff(pointers) == 1)
+        ):
+            return self.get_window_view(start, end)
+        else:
+            return self.obs_array[np.asarray(pointers)]
+
     def get_single_obs(self, pointer):
         """
         Args:
@@ -75,12 +167,7 @@ class Trip(object):
             obs_array (numpy.array): array with the multidimensional observation in the original trip. It take a single
             observation from the trip's time-series in all its dimensions.
         """
-        obs_list = []
-        for signal in self.signals:
-            signal_obs = signal[pointer]
-            obs_list.append(signal_obs)
-        obs_array = np.array(obs_list)
-        return obs_array
+        return self.obs_array[pointer]
 
     def get_windown_obs(self, pointers):
         """
@@ -91,13 +178,10 @@ class Trip(object):
         Returns:
             windown_obs (list numpy.array): list of arrays with the multidimensional observations in the original trip.
             Each entry of the list corresponds to a single observation taken from the trip's time-series and thus, the
-            length of the list is equal to the length of the pointers' list.
+            length of the list is equal to the length of the pointers' list. Prefer `get_pointers_view`, which returns
+            the same observations as a single 2-dimensional array.
         """
-        windown_obs = []
-        for pointer in pointers:
-            point_obs = self.get_single_obs(pointer)
-            windown_obs.append(point_obs)
-        return windown_obs
+        return list(self.get_pointers_view(pointers))
 
     def get_windown_obs_in_dim(self, pointers, dim):
         signal = self.get_signal(dim)
@@ -160,13 +244,20 @@ class Trip(object):
         Returns:
             signal (numpy.array): time-series of the trip's signal.
         """
-        signal = self.signals[dim]
+        signal = self.obs_array[:, dim]
         return signal
 
     def update_signal(self, dim, new_signal):
-        new_signal_list = self.signals
-        new_signal_list[dim] = new_signal
-        self.signals = new_signal_list
+        if len(new_signal) != self.n_obs:
+            raise Exception(
+                "The size of the new signal is inconsistent with the trip size. "
+                "Make sure the new signal has the same number of observations as the trip"
+            )
+        if np.result_type(self.obs_array, new_signal) != self.obs_array.dtype:
+            self.obs_array = self.obs_array.astype(
+                np.result_type(self.obs_array, new_signal)
+            )
+        self.obs_array[:, dim] = new_signal
 
     def get_trip_size(self):
         """
@@ -198,3 +289,32 @@ class Trip(object):
         for label in labels_set:
             labels_dict[label] = np.argwhere(labels_array == label).reshape(-1).tolist()
         return labels_dict
+
+
+class _SignalList(list):
+    """
+    List with the column views of a trip's obs_array, as returned by `Trip.signals`. Assigning one of its items updates
+    the signal in the trip (see `Trip.update_signal`), so that it behaves as the list of signals that the trip used to
+    keep.
+    """
+
+    def __init__(self, trip):
+        super().__init__(trip.obs_array[:, dim] for dim in range(trip.n_dim))
+        self._trip = trip
+
+    def __setitem__(self, dim, new_signal):
+        if isinstance(dim, slice):
+            dim_list = range(*dim.indices(len(self)))
+            new_signal_list = list(new_signal)
+            if len(new_signal_list) != len(dim_list):
+                raise Exception("The number of signals of a trip can not be changed")
+        else:
+            dim_list = [range(len(self))[dim]]
+            new_signal_list = [new_signal]
+        for d, signal in zip(dim_list, new_signal_list):
+            self._trip.update_signal(d, signal)
+        # update_signal may replace obs_array, so all the views are taken again
+        super().__setitem__(
+            slice(None),
+            [self._trip.obs_array[:, d] for d in range(self._trip.n_dim)],
+        )
@@ -0,0 +1,317 @@
+import os
+import json
+import numpy as np
+from tripMD.objects.trip import Trip
+
+METADATA_FILE = "metadata.json"
+OFFSETS_FILE = "offsets.npy"
+TRIP_IDS_FILE = "trip_ids.npy"
+TIMESTAMPS_FILE = "timestamps.npy"
+
+
+class TripStore(object):
+    """
+    On-disk store of trips that can replace a list of Trip objects. The trips' signals are kept in one flat binary file
+    per dimension (all trips concatenated) plus an index with the offsets of each trip. The files are opened with
+    `numpy.memmap`, so the data is only loaded on demand and several processes reading the same store share a single
+    copy of it through the OS page cache. A store is created with `save_trip_store`.
+
+    Args:
+        folder_path (str): path to the folder where the store was saved.
+
+    Attributes:
+        folder_path (str): path to the folder where the store was saved.
+        n_trips (int): number of trips in the store.
+        n_dim (int): dimension of the trips (i.e. number of signals).
+        trip_ids (numpy.array): ID of each trip.
+        offsets (numpy.array): array of size n_trips + 1 with the position of the first observation of each trip in the
+        flat signal files. The last entry is the total number of observations.
+        signals (list of numpy.memmap): list with a flat memory-mapped array per dimension.
+        timestamps (numpy.array): flat array with the timestamps of all the observations. It is memory-mapped, unless the
+        timestamps are python objects (e.g. pandas' Timestamps).
+        labels (list of numpy.array): list with a flat array per label with the labels of all the observations. It is
+        None if the trips have no labels.
+    """
+
+    def __init__(self, folder_path):
+        """
+        Constructor for the TripStore class.
+
+        Args:
+            folder_path (str): path to the folder where the store was saved.
+        """
+        self.folder_path = os.path.abspath(folder_path)
+        self._open()
+
+    def _open(self):
+        with open(os.path.join(self.folder_path, METADATA_FILE), "r") as f:
+            metadata = json.load(f)
+        self.n_dim = metadata["n_dim"]
+        self.n_trips = metadata["n_trips"]
+        self.offsets = np.load(os.path.join(self.folder_path, OFFSETS_FILE))
+        self.trip_ids = np.load(os.path.join(self.folder_path, TRIP_IDS_FILE))
+        n_total_obs = int(self.offsets[-1])
+        self.signals = [
+            np.memmap(
+                os.path.join(self.folder_path, _get_signal_file_name(dim)),
+                dtype=metadata["dtype"],
+                mode="r",
+                shape=(n_total_obs,),
+            )
+            for dim in range(self.n_dim)
+        ]
+        self.timestamps = _load_flat_array(
+            os.path.join(self.folder_path, TIMESTAMPS_FILE)
+        )
+        if metadata["n_labels"] == 0:
+            self.labels = None
+        else:
+            self.labels = [
+                _load_flat_array(
+                    os.path.join(self.folder_path, _get_label_file_name(i))
+                )
+                for i in range(metadata["n_labels"])
+            ]
+
+    def __getstate__(self):
+        # only the path is pickled: the memory maps are reopened by whoever unpickles the store
+        return {"folder_path": self.folder_path}
+
+    def __setstate__(self, state):
+        self.folder_path = state["folder_path"]
+        self._open()
+
+    def __len__(self):
+        return self.n_trips
+
+    def __getitem__(self, trip_index):
+        if trip_index < 0:
+            trip_index = trip_index + self.n_trips
+        if trip_index < 0 or trip_index >= self.n_trips:
+            raise IndexError("The trip index is out of range")
+        return StoredTrip(self, trip_index)
+
+    def __iter__(self):
+        for trip_index in range(self.n_trips):
+            yield StoredTrip(self, trip_index)
+
+    def get_trip_bounds(self, trip_index):
+        """
+        Args:
+            trip_index (int): index of the trip in the store.
+
+        Returns:
+            start (int): position of the first observation of the trip in the flat signal files.
+            end (int): position right after the last observation of the trip in the flat signal files.
+        """
+        return int(self.offsets[trip_index]), int(self.offsets[trip_index + 1])
+
+    def get_signal(self, dim):
+        """
+        Args:
+            dim (int): index of signal that should be extracted.
+
+        Returns:
+            signal (numpy.memmap): flat memory-mapped array with the signal of all trips concatenated.
+        """
+        return self.signals[dim]
+
+    def get_trip_dimensions(self):
+        """
+        Returns:
+            n_dim (int): dimension of the trips (i.e. number of signals)
+        """
+        return self.n_dim
+
+
+class StoredTrip(Trip):
+    """
+    Lazy view of a single trip from a TripStore. It has the same interface as the Trip object, but no data is read from
+    disk until it is needed. Windows and signals are read directly from the store's memory maps, while the full
+    observations' array is only built (and cached in the object) when a method requires it.
+
+    Args:
+        trip_store (tripMD.objects.trip_store.TripStore): store that contains the trip.
+        trip_index (int): index of the trip in the store.
+    """
+
+    def __init__(self, trip_store, trip_index):
+        """
+        Constructor for the StoredTrip class.
+
+        Args:
+            trip_store (tripMD.objects.trip_store.TripStore): store that contains the trip.
+            trip_index (int): index of the trip in the store.
+        """
+        self._store = trip_store
+        self._start, self._end = trip_store.get_trip_bounds(trip_index)
+        self._obs_array = None
+        self.n_obs = self._end - self._start
+        self.n_dim = trip_store.get_trip_dimensions()
+        self.id = trip_store.trip_ids[trip_index].item()
+
+    @property
+    def obs_array(self):
+        if self._obs_array is None:
+            self._obs_array = self._read_obs(0, self.n_obs)
+        return self._obs_array
+
+    @obs_array.setter
+    def obs_array(self, new_obs_array):
+        self._obs_array = new_obs_array
+
+    @property
+    def timestamps(self):
+        return self._store.timestamps[self._start : self._end]
+
+    @property
+    def labels(self):
+        if self._store.labels is None:
+            return None
+        else:
+            return [label[self._start : self._end] for label in self._store.labels]
+
+    def _read_obs(self, start, end):
+        signal_list = [
+            signal[self._start + start : self._start + end]
+            for signal in self._store.signals
+        ]
+        return np.ascontiguousarray(np.column_stack(signal_list))
+
+    def get_window_view(self, start, end):
+        if self._obs_array is None:
+            return self._read_obs(start, end)
+        else:
+            return self._obs_array[start:end]
+
+    def get_signal(self, dim):
+        if self._obs_array is None:
+            return self._store.signals[dim][self._start : self._end]
+        else:
+            return self._obs_array[:, dim]
+
+    def to_trip(self):
+        """
+        Returns:
+            trip (tripMD.objects.trip.Trip): in-memory copy of the trip, which no longer depends on the store's files.
+            As in a trip built from a dataframe, its timestamps and labels are lists.
+        """
+        signal_list = [np.array(self.get_signal(dim)) for dim in range(self.n_dim)]
+        if self.labels is None:
+            labels_list = None
+        else:
+            labels_list = [label.tolist() for label in self.labels]
+        return Trip(
+            signal_list,
+            self.id,
+            timestamps=self.timestamps.tolist(),
+            labels_list=labels_list,
+        )
+
+
+def save_trip_store(trip_list, folder_path, dtype=np.float64):
+    """
+    This function saves a list of trips in the TripStore format. The trips are written one at a time, so trip_list can
+    also be a generator of trips that do not fit in memory.
+
+    Args:
+        trip_list (list of tripMD.objects.trip.Trip): list of trips to be saved.
+        folder_path (str): path to the folder where the store is saved. It is created if it does not exist.
+        dtype (numpy.dtype): data type of the saved signals.
+
+    Returns:
+        trip_store (tripMD.objects.trip_store.TripStore): the saved store, opened from folder_path.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    offsets = [0]
+    trip_ids = []
+    timestamps_list = []
+    labels_list = None
+    signal_files = None
+    n_dim = None
+    try:
+        for trip in trip_list:
+            if n_dim is None:
+                n_dim = trip.get_trip_dimensions()
+                signal_files = [
+                    open(os.path.join(folder_path, _get_signal_file_name(dim)), "wb")
+                    for dim in range(n_dim)
+                ]
+                if trip.labels is not None:
+                    labels_list = [[] for _ in trip.labels]
+            elif trip.get_trip_dimensions() != n_dim:
+                raise Exception(
+                    "Dimension of provided trips is inconsistent. Make sure that all trips"
+                    " have the same feature/signals"
+                )
+            for dim in range(n_dim):
+                signal = np.ascontiguousarray(trip.get_signal(dim), dtype=dtype)
+                signal_files[dim].write(signal.tobytes())
+            offsets.append(offsets[-1] + trip.get_trip_size())
+            trip_ids.append(trip.id)
+            timestamps_list.append(_get_flat_array(trip.get_timestamps()))
+            if labels_list is not None:
+                for i, trip_labels in enumerate(trip.labels):
+                    labels_list[i].append(_get_flat_array(trip_labels))
+    finally:
+        if signal_files is not None:
+            for signal_file in signal_files:
+                signal_file.close()
+    if n_dim is None:
+        raise Exception("No trips were provided to save in the store")
+    np.save(os.path.join(folder_path, OFFSETS_FILE), np.array(offsets, dtype=np.int64))
+    np.save(os.path.join(folder_path, TRIP_IDS_FILE), np.array(trip_ids))
+    timestamps_array = np.concatenate(timestamps_list)
+    np.save(
+        os.path.join(folder_path, TIMESTAMPS_FILE),
+        timestamps_array,
+        allow_pickle=timestamps_array.dtype.hasobject,
+    )
+    n_labels = 0
+    if labels_list is not None:
+        n_labels = len(labels_list)
+        for i, label_arrays in enumerate(labels_list):
+            label_array = np.concatenate(label_arrays)
+            np.save(
+                os.path.join(folder_path, _get_label_file_name(i)),
+                label_array,
+                allow_pickle=label_array.dtype.hasobject,
+            )
+    metadata = {
+        "n_trips": len(trip_ids),
+        "n_dim": n_dim,
+        "dtype": np.dtype(dtype).name,
+        "n_labels": n_labels,
+    }
+    with open(os.path.join(folder_path, METADATA_FILE), "w") as f:
+        json.dump(metadata, f)
+    return TripStore(folder_path)
+
+
+def _get_signal_file_name(dim):
+    return "signal_{}.bin".format(dim)
+
+
+def _get_label_file_name(index):
+    return "labels_{}.npy".format(index)
+
+
+def _get_flat_array(values):
+    flat_array = np.asarray(values)
+    if (
+        (flat_array.dtype.kind in "US")
+        and not isinstance(values, np.ndarray)
+        and not all(isinstance(value, str) for value in values)
+    ):
+        # numpy would convert the values that are not strings to strings, so mixed types are kept as objects
+        flat_array = np.array(values, dtype=object)
+    return flat_array
+
+
+def _load_flat_array(file_path):
+    try:
+        return np.load(file_path, mmap_mode="r")
+    except ValueError:
+        # timestamps and labels that are python objects (e.g. pandas' Timestamps, strings of different lengths or mixed
+        # types) are saved as object arrays, which can not be memory-mapped
+        return np.load(file_path, allow_pickle=True)
@@ -0,0 +1,95 @@
+import numpy as np
+from saxpy.strfunc import idx2letter
+
+
+def get_alphabet_size(cuts_dict):
+    """
+    Args:
+        cuts_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
+        dimensions' vsax cuts
+
+    Returns:
+        alphabet_size (int): number of symbols of the 1-dim letters, i.e. the number of intervals defined by the cuts.
+    """
+    return max(len(cuts) for cuts in cuts_dict.values())
+
+
+def encode_letter_codes(letter_codes, alphabet_size):
+    """
+    This function packs the symbols of each multidimensional letter into a single int, as a number written in base
+    alphabet_size where the symbol of the dimension d is the d-th digit. Two letters have the same code if and only if
+    they have the same symbols in all dimensions.
+
+    Args:
+        letter_codes (numpy.array): array of int of shape (n_letters, n_dim) with the symbols of each letter.
+        alphabet_size (int): number of symbols of the 1-dim letters.
+
+    Returns:
+        letters (numpy.array): array of int of size n_letters with the code of each letter.
+    """
+    n_dim = letter_codes.shape[1]
+    if alphabet_size**n_dim > np.iinfo(np.int64).max:
+        raise Exception(
+            "The letters of {} dimensions with {} symbols each can not be encoded in 64 bits".format(
+                n_dim, alphabet_size
+            )
+        )
+    weights = alphabet_size ** np.arange(n_dim, dtype=np.int64)
+    return np.asarray(letter_codes, dtype=np.int64) @ weights
+
+
+def decode_letter(letter, n_dim, alphabet_size):
+    """
+    Args:
+        letter (int): code of a multidimensional letter (see `encode_letter_codes`).
+        n_dim (int): number of dimensions of the letter.
+        alphabet_size (int): number of symbols of the 1-dim letters.
+
+    Returns:
+        letter_codes (list of int): symbol of the letter in each dimension.
+    """
+    letter_codes = []
+    for _ in range(n_dim):
+        letter, code = divmod(letter, alphabet_size)
+        letter_codes.append(code)
+    return letter_codes
+
+
+def decode_pattern(pattern, n_dim, alphabet_size):
+    """
+    This function converts an encoded pattern back to the string representation of the vsax words (e.g., ("abcc",
+    "ddce") for a 2-dimensional word with 4 letters).
+
+    Args:
+        pattern (tuple of int): code of each letter of the pattern.
+        n_dim (int): number of dimensions of the letters.
+        alphabet_size (int): number of symbols of the 1-dim letters.
+
+    Returns:
+        str_rep (tuple of str): string representation of the pattern. Each entry in the tuple is the 1-dim word of a
+        single signal.
+    """
+    letter_codes_list = [
+        decode_letter(letter, n_dim, alphabet_size) for letter in pattern
+    ]
+    return tuple(
+        "".join(idx2letter(letter_codes[dim]) for letter_codes in letter_codes_list)
+        for dim in range(n_dim)
+    )
+
+
+def encode_str_rep(str_rep, alphabet_size):
+    """
+    This function is the inverse of `decode_pattern`.
+
+    Args:
+        str_rep (tuple of str): string representation of a vsax word, with a 1-dim word per signal.
+        alphabet_size (int): number of symbols of the 1-dim letters.
+
+    Returns:
+        pattern (tuple of int): code of each letter of the word.
+    """
+    letter_codes = np.array(
+        [[ord(letter) - ord("a") for letter in word] for word in str_rep]
+    ).T.reshape(-1, len(str_rep))
+    return tuple(encode_letter_codes(letter_codes, alphabet_size).tolist())
@@ -1,14 +1,27 @@
 import numpy as np
+from tripMD.objects.trip_store import TripStore
+from tripMD.vsax.quantile_sketch import QuantileSketch
 
+CUTS_PERCENTILES = [5, 15, 85, 95]
+EXACT_MAX_SIZE = 10000000
 
-def compute_vsax_cuts(trip_list):
+
+def compute_vsax_cuts(
+    trip_list, exact_max_size=EXACT_MAX_SIZE, relative_accuracy=0.001
+):
     """
     This function computes the cuts for transforming each signal into a sequence of vsax letters. The function will return
     an array of cuts for each trips' dimension and the cuts are computed consistently for all trips. This means that
-    two points with the same value in two different trips will be mapped to the same letter.
+    two points with the same value in two different trips will be mapped to the same letter. When the trips have up to
+    exact_max_size observations, the cuts are the exact percentiles of the joined signals. For bigger inputs, the
+    percentiles are estimated with a streaming sketch built trip by trip, which never joins the signals in memory.
 
     Args:
-        trip_list (list of tripMD.objects.trip.Trip): original list of trips that need to be normalized
+        trip_list (list of tripMD.objects.trip.Trip): original list of trips that need to be normalized. It can also be
+        a tripMD.objects.trip_store.TripStore
+        exact_max_size (int): maximum number of observations (over all trips) for which the exact cuts are computed.
+        relative_accuracy (float): relative error bound of the estimated cuts, used when the number of observations
+        is higher than exact_max_size.
 
     Returns:
         cuts_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
@@ -16,13 +29,32 @@ def compute_vsax_cuts(trip_list):
 
     """
     n_dim = get_n_dim_from_trip_list(trip_list)
+    n_obs = get_n_obs_from_trip_list(trip_list)
     cuts_dict = {}
     for dim in range(n_dim):
         signal_list = get_1dim_signal_list(trip_list, dim)
-        cuts_dict[dim] = get_1dim_cuts(signal_list)
+        if n_obs <= exact_max_size:
+            cuts_dict[dim] = get_1dim_cuts(signal_list)
+        else:
+            sketch = get_1dim_sketch(signal_list, relative_accuracy)
+            cuts_dict[dim] = get_1dim_cuts_from_sketch(sketch)
     return cuts_dict
 
 
+def get_n_obs_from_trip_list(trip_list):
+    """
+
+    Args:
+        trip_list (list of tripMD.objects.Trip): original list of trips that need to be normalized
+
+    Returns:
+        n_obs (int): total number of observations of all trips
+    """
+    if isinstance(trip_list, TripStore):
+        return int(trip_list.offsets[-1])
+    return sum(trip.get_trip_size() for trip in trip_list)
+
+
 def get_n_dim_from_trip_list(trip_list):
     """
 
@@ -32,6 +64,8 @@ def get_n_dim_from_trip_list(trip_list):
     Returns:
 
     """
+    if isinstance(trip_list, TripStore):
+        return trip_list.get_trip_dimensions()
     n_dim_list = [trip.get_trip_dimensions() for trip in trip_list]
     if len(set(n_dim_list)) != 1:
         raise Exception(
@@ -53,6 +87,9 @@ def get_1dim_signal_list(trip_list, dim):
     Returns:
 
     """
+    if isinstance(trip_list, TripStore):
+        # the store already keeps the signal of all trips concatenated
+        return [trip_list.get_signal(dim)]
     signal_list = []
     for trip in trip_list:
         signal = trip.get_signal(dim)
@@ -72,9 +109,38 @@ def get_1dim_cuts(signal_list):
     """
     joined_signal = np.concatenate(signal_list)
     # centered_signal = joined_signal - np.mean(joined_signal)
-    p5 = np.percentile(joined_signal, 5)
-    p15 = np.percentile(joined_signal, 15)
-    p85 = np.percentile(joined_signal, 85)
-    p95 = np.percentile(joined_signal, 95)
-    signal_cuts = np.array([-np.inf, p5, p15, p85, p95])
+    # a single call partitions the joined signal once for all the percentiles
+    percentiles = np.percentile(joined_signal, CUTS_PERCENTILES)
+    signal_cuts = np.concatenate(([-np.inf], percentiles))
+    return signal_cuts
+
+
+def get_1dim_sketch(signal_list, relative_accuracy):
+    """
+
+    Args:
+        signal_list (list of numpy.array): list of 1-dim signals, taken from the list of trips
+        relative_accuracy (float): relative error bound of the sketch
+
+    Returns:
+        sketch (tripMD.vsax.quantile_sketch.QuantileSketch): streaming sketch of the values of all the signals. Sketches
+        of different groups of trips can be combined with its `merge` method.
+    """
+    sketch = QuantileSketch(relative_accuracy)
+    for signal in signal_list:
+        sketch.add(signal)
+    return sketch
+
+
+def get_1dim_cuts_from_sketch(sketch):
+    """
+
+    Args:
+        sketch (tripMD.vsax.quantile_sketch.QuantileSketch): streaming sketch of the values of a signal
+
+    Returns:
+        signal_cuts (numpy.array): estimated vsax cuts of the signal
+    """
+    percentiles = sketch.get_percentile(CUTS_PERCENTILES)
+    signal_cuts = np.concatenate(([-np.inf], percentiles))
     return signal_cuts
@@ -0,0 +1,144 @@
+import numpy as np
+
+
+def compute_window_means(obs_array, window_size):
+    """
+    This function computes the mean of every sliding window of a trip in all its dimensions at once, using cumulative
+    sums.
+
+    Args:
+        obs_array (numpy.array): 2-dimensional array of shape (n_obs, n_dim) with the trip's observations.
+        window_size (int): number of observations in each window.
+
+    Returns:
+        window_means (numpy.array): array of shape (n_obs - window_size + 1, n_dim) where the t-th row has the mean of
+        the window that starts at observation t.
+    """
+    n_windows = max(len(obs_array) - window_size + 1, 0)
+    cum_sum = np.zeros((len(obs_array) + 1, obs_array.shape[1]))
+    np.cumsum(obs_array, axis=0, dtype=float, out=cum_sum[1:])
+    window_means = (cum_sum[window_size:] - cum_sum[:n_windows]) / window_size
+    return window_means[:n_windows]
+
+
+def cuts_changed_for_trip(obs_array, window_size, old_cuts, new_cuts):
+    """
+    This function checks if changing the cuts from old_cuts to new_cuts may change any letter of a trip. A letter can
+    only change if the mean of its window is between the old and the new value of one of the cuts. The test is
+    conservative: a small margin is added to each interval, so that it may return True for a trip whose letters do not
+    change, but never the opposite.
+
+    Args:
+        obs_array (numpy.array): 2-dimensional array of shape (n_obs, n_dim) with the trip's observations.
+        window_size (int): number of observations in each letter's window.
+        old_cuts (dict of numpy.array): cuts used to compute the trip's letters.
+        new_cuts (dict of numpy.array): updated cuts.
+
+    Returns:
+        cuts_changed (bool): whether the trip's letters may change with the new cuts.
+    """
+    window_means = compute_window_means(obs_array, window_size)
+    for dim in range(obs_array.shape[1]):
+        old_dim_cuts = np.asarray(old_cuts[dim])
+        new_dim_cuts = np.asarray(new_cuts[dim])
+        moved_cuts = np.flatnonzero(old_dim_cuts != new_dim_cuts)
+        if len(moved_cuts) == 0:
+            continue
+        dim_means = window_means[:, dim]
+        margin = 1e-9 * (1 + np.abs(dim_means))
+        for cut_index in moved_cuts:
+            lower = min(old_dim_cuts[cut_index], new_dim_cuts[cut_index])
+            upper = max(old_dim_cuts[cut_index], new_dim_cuts[cut_index])
+            if np.any((dim_means + margin >= lower) & (dim_means - margin <= upper)):
+                return True
+    return False
+
+
+def compute_letter_codes(obs_array, window_size, cuts_dict):
+    """
+    This function computes the vsax symbol of every sliding window of a trip in all its dimensions at once. The symbol
+    of a window is the index of the interval defined by the cuts where the window's mean falls, which is exactly the
+    letter that saxpy's `paa` and `ts_to_string` compute for it (the symbol 0 corresponds to "a", 1 to "b" and so on).
+    The means are computed with cumulative sums and the few windows whose mean is so close to a cut (or to zero) that
+    the rounding errors of the cumulative sums could change the symbol are recomputed with a sequential sum, as in
+    saxpy.
+
+    Args:
+        obs_array (numpy.array): 2-dimensional array of shape (n_obs, n_dim) with the trip's observations.
+        window_size (int): number of observations in each window.
+        cuts_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
+        dimensions' vsax cuts
+
+    Returns:
+        letter_codes (numpy.array): array of int of shape (n_obs - window_size + 1, n_dim) where the t-th row has the
+        symbols of the window that starts at observation t.
+    """
+    window_means = compute_window_means(obs_array, window_size)
+    n_windows, n_dim = window_means.shape
+    letter_codes = np.zeros((n_windows, n_dim), dtype=np.int64)
+    if n_windows == 0:
+        return letter_codes
+    for dim in range(n_dim):
+        dim_means = window_means[:, dim]
+        dim_cuts = np.asarray(cuts_dict[dim], dtype=float)
+        signal = np.asarray(obs_array[:, dim], dtype=float)
+        # first order bound of the rounding error of the means computed with cumulative sums
+        error_bound = (
+            4 * len(signal) * np.finfo(float).eps * np.sum(np.abs(signal)) / window_size
+        )
+        thresholds = np.append(dim_cuts[np.isfinite(dim_cuts)], 0.0)
+        is_ambiguous = np.zeros(n_windows, dtype=bool)
+        for threshold in thresholds:
+            is_ambiguous |= np.abs(dim_means - threshold) <= error_bound
+        ambiguous_starts = np.flatnonzero(is_ambiguous)
+        if len(ambiguous_starts) > 0:
+            dim_means = dim_means.copy()
+            dim_means[ambiguous_starts] = _compute_sequential_window_means(
+                signal, ambiguous_starts, window_size
+            )
+        letter_codes[:, dim] = _get_symbol_index(dim_means, dim_cuts)
+    return letter_codes
+
+
+def run_length_encode(letter_codes):
+    """
+    This function merges the runs of consecutive windows with the same symbols in all dimensions.
+
+    Args:
+        letter_codes (numpy.array): array of shape (n_windows, n_dim) with the symbols of each sliding window.
+
+    Returns:
+        run_starts (numpy.array): index of the first window of each run.
+        run_ends (numpy.array): index right after the last window of each run.
+        run_codes (numpy.array): array of shape (n_runs, n_dim) with the symbols of each run.
+    """
+    n_windows = len(letter_codes)
+    if n_windows == 0:
+        empty_index = np.zeros(0, dtype=np.int64)
+        return empty_index, empty_index, letter_codes
+    is_new_run = np.any(letter_codes[1:] != letter_codes[:-1], axis=1)
+    run_starts = np.concatenate(([0], np.flatnonzero(is_new_run) + 1))
+    run_ends = np.append(run_starts[1:], n_windows)
+    run_codes = letter_codes[run_starts]
+    return run_starts, run_ends, run_codes
+
+
+def _compute_sequential_window_means(signal, window_starts, window_size):
+    # same order of the additions as saxpy's paa, which adds the window's values one at a time
+    window_sums = np.zeros(len(window_starts))
+    for i in range(window_size):
+        window_sums += signal[window_starts + i]
+    if window_size == 1:
+        return window_sums
+    return window_sums / window_size
+
+
+def _get_symbol_index(values, cuts):
+    # saxpy's ts_to_string counts the cuts (except the first) strictly below non-negative values and the cuts below or
+    # equal to negative values
+    symbol_index = np.searchsorted(cuts[1:], values, side="left")
+    is_negative = values < 0
+    symbol_index[is_negative] = np.searchsorted(
+        cuts[1:], values[is_negative], side="right"
+    )
+    return symbol_index
@@ -0,0 +1,120 @@
+import pickle
+import numpy as np
+from tripMD.vsax import compute_cuts
+
+
+class VSaxCuts(object):
+    """
+    Object for vsax cuts that can be updated incrementally. Besides the cuts, it keeps their sufficient statistics (a
+    mergeable quantile sketch per dimension), so that new trips can be added without going through the old ones again.
+    The cuts in use only change when the cuts estimated from the updated statistics drift more than a given tolerance,
+    which allows reusing the letter sequences computed with them (see `VSaxSequence.add_trips`). Note that the cuts are
+    always estimated from the sketches and thus, they are within relative_accuracy of the exact percentiles.
+
+    Args:
+        trip_list (list of tripMD.objects.trip.Trip): list of trips used to compute the initial cuts. It can also be a
+        tripMD.objects.trip_store.TripStore.
+        relative_accuracy (float): relative error bound of the sketches used to estimate the cuts.
+
+    Attributes:
+        relative_accuracy (float): relative error bound of the sketches used to estimate the cuts.
+        n_dim (int): dimension of the trips (i.e. number of signals)
+        sketch_dict (dict of tripMD.vsax.quantile_sketch.QuantileSketch): dictionary where the keys are the trips'
+        dimensions and the values are the sketches with the values of all the trips added so far.
+        cuts_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
+        dimensions' vsax cuts currently in use.
+    """
+
+    def __init__(self, trip_list, relative_accuracy=0.001):
+        """
+        Constructor for the VSaxCuts class.
+
+        Args:
+            trip_list (list of tripMD.objects.trip.Trip): list of trips used to compute the initial cuts.
+            relative_accuracy (float): relative error bound of the sketches used to estimate the cuts.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.n_dim = compute_cuts.get_n_dim_from_trip_list(trip_list)
+        self.sketch_dict = self._compute_sketch_dict(trip_list)
+        self.cuts_dict = self._compute_cuts_from_sketches()
+
+    def _compute_sketch_dict(self, trip_list):
+        sketch_dict = {}
+        for dim in range(self.n_dim):
+            signal_list = compute_cuts.get_1dim_signal_list(trip_list, dim)
+            sketch_dict[dim] = compute_cuts.get_1dim_sketch(
+                signal_list, self.relative_accuracy
+            )
+        return sketch_dict
+
+    def _compute_cuts_from_sketches(self):
+        cuts_dict = {}
+        for dim in range(self.n_dim):
+            cuts_dict[dim] = compute_cuts.get_1dim_cuts_from_sketch(
+                self.sketch_dict[dim]
+            )
+        return cuts_dict
+
+    def get_cuts(self):
+        """
+        Returns:
+            cuts_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
+            dimensions' vsax cuts currently in use.
+        """
+        return self.cuts_dict
+
+    def update(self, new_trip_list, tolerance=0.0):
+        """
+        Adds new trips to the cuts' statistics and computes how far each cut moved. If all cuts moved at most
+        `tolerance`, the cuts in use are kept. Otherwise, they are replaced by the updated ones.
+
+        Args:
+            new_trip_list (list of tripMD.objects.trip.Trip): list of new trips.
+            tolerance (float): maximum drift (in the units of the signals) for which the current cuts are kept.
+
+        Returns:
+            drift_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are the
+            absolute differences between the updated cuts and the cuts in use before the update.
+            cuts_changed (bool): whether the cuts in use were replaced by the updated ones.
+        """
+        if compute_cuts.get_n_dim_from_trip_list(new_trip_list) != self.n_dim:
+            raise Exception(
+                "Dimension of provided trips is inconsistent. Make sure that all trips"
+                " have the same feature/signals"
+            )
+        new_sketch_dict = self._compute_sketch_dict(new_trip_list)
+        for dim in range(self.n_dim):
+            self.sketch_dict[dim].merge(new_sketch_dict[dim])
+        updated_cuts_dict = self._compute_cuts_from_sketches()
+        drift_dict = {}
+        for dim in range(self.n_dim):
+            # the first cut is always -inf, so it never moves
+            drift = np.abs(updated_cuts_dict[dim][1:] - self.cuts_dict[dim][1:])
+            drift_dict[dim] = np.concatenate(([0.0], drift))
+        max_drift = max(np.max(drift) for drift in drift_dict.values())
+        cuts_changed = max_drift > tolerance
+        if cuts_changed:
+            self.cuts_dict = updated_cuts_dict
+        return drift_dict, cuts_changed
+
+    def save(self, file_path):
+        """
+        Saves the cuts and their statistics with pickle.
+
+        Args:
+            file_path (str): path of the file where the object is saved.
+        """
+        with open(file_path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(file_path):
+        """
+        Args:
+            file_path (str): path of the file where the object was saved with `save`.
+
+        Returns:
+            vsax_cuts (tripMD.vsax.objects.vsax_cuts.VSaxCuts): the loaded cuts.
+        """
+        with open(file_path, "rb") as f:
+            return pickle.load(f)
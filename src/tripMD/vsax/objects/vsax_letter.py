@@ -46,6 +46,28 @@ class VSaxLetter(object):
         self._cuts = cuts
         self._rep = self._compute_str_rep(segment_ts_list)
 
+    @classmethod
+    def from_str_rep(cls, str_rep, segment_pointers, cuts):
+        """
+        Alternative constructor for the class VSaxLetter, for when the string representation was already computed
+        (e.g., by the vectorized engine in tripMD.vsax.compute_letters).
+
+        Args:
+            str_rep (tuple of str): string representation of the letter, with a 1-dim letter per signal.
+            segment_pointers (list of int): list with the indices of the letter in the original trip.
+            cuts (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are that
+            dimensions' vsax cuts
+
+        Returns:
+            vsax_letter (tripMD.vsax.objects.vsax_letter.VSaxLetter): the letter with the given representation.
+        """
+        vsax_letter = cls.__new__(cls)
+        vsax_letter._ndim = len(str_rep)
+        vsax_letter._pointers = segment_pointers
+        vsax_letter._cuts = cuts
+        vsax_letter._rep = str_rep
+        return vsax_letter
+
     def _compute_str_rep(self, segment_ts_list):
         str_rep = []
         for dim in range(self._ndim):
@@ -78,6 +100,9 @@ class VSaxLetter(object):
         else:
             raise IndexError("The provided dimension is out of range")
 
+    def get_cuts(self):
+        return self._cuts
+
     def get_pointers(self):
         return self._pointers
 
@@ -0,0 +1,149 @@
+import numpy as np
+from saxpy.strfunc import idx2letter
+from tripMD.vsax.alphabet import encode_letter_codes
+from tripMD.vsax.compute_letters import run_length_encode
+from tripMD.vsax.objects.vsax_letter import VSaxLetter
+
+
+class VSaxLetterSequence(object):
+    """
+    Object for the sequence of variable sax letters of a single trip, stored as run-length encoded arrays. Each letter
+    is a run of consecutive sliding windows with the same symbols and it is kept as the observations' interval that it
+    covers plus an integer symbol per dimension (0 for "a", 1 for "b" and so on). The symbols of all dimensions are
+    also packed in a single int per letter (see tripMD.vsax.alphabet), which is what words and patterns are made of.
+    This replaces a list of tripMD.vsax.objects.vsax_letter.VSaxLetter objects, which can still be built on demand with
+    `get_letter`.
+
+    Args:
+        starts (numpy.array): pointer to the first observation of each letter in the original trip.
+        ends (numpy.array): pointer to the observation right after the last one of each letter in the original trip.
+        codes (numpy.array): array of shape (n_letters, n_dim) with the symbols of each letter.
+        letter_size (int): number of observations in each sliding window (i.e. the default letter size).
+        alphabet_size (int): number of symbols of the 1-dim letters.
+
+    Attributes:
+        starts (numpy.array): pointer to the first observation of each letter in the original trip.
+        ends (numpy.array): pointer to the observation right after the last one of each letter in the original trip.
+        codes (numpy.array): array of shape (n_letters, n_dim) with the symbols of each letter.
+        letter_size (int): number of observations in each sliding window (i.e. the default letter size).
+        alphabet_size (int): number of symbols of the 1-dim letters.
+        letters (numpy.array): code of each letter, with the symbols of all dimensions packed in a single int.
+    """
+
+    def __init__(self, starts, ends, codes, letter_size, alphabet_size):
+        """
+        Constructor for the VSaxLetterSequence class.
+
+        Args:
+            starts (numpy.array): pointer to the first observation of each letter in the original trip.
+            ends (numpy.array): pointer to the observation right after the last one of each letter in the original
+            trip.
+            codes (numpy.array): array of shape (n_letters, n_dim) with the symbols of each letter.
+            letter_size (int): number of observations in each sliding window (i.e. the default letter size).
+            alphabet_size (int): number of symbols of the 1-dim letters.
+        """
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.letter_size = letter_size
+        self.alphabet_size = alphabet_size
+        self.letters = encode_letter_codes(self.codes, alphabet_size)
+
+    @classmethod
+    def from_window_codes(cls, letter_codes, letter_size, alphabet_size):
+        """
+        Alternative constructor for the VSaxLetterSequence class, which merges the runs of consecutive sliding windows
+        with the same symbols into a single letter.
+
+        Args:
+            letter_codes (numpy.array): array of shape (n_windows, n_dim) with the symbols of each sliding window (see
+            tripMD.vsax.compute_letters.compute_letter_codes).
+            letter_size (int): number of observations in each sliding window.
+            alphabet_size (int): number of symbols of the 1-dim letters.
+
+        Returns:
+            letter_sequence (tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): the trip's letters.
+        """
+        run_starts, run_ends, run_codes = run_length_encode(letter_codes)
+        return cls(
+            run_starts,
+            run_ends + letter_size - 1,
+            run_codes,
+            letter_size,
+            alphabet_size,
+        )
+
+    @classmethod
+    def concatenate(cls, letter_seq_list):
+        """
+        Args:
+            letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): non-empty list of
+            letter sequences with the same letter size and alphabet.
+
+        Returns:
+            letter_sequence (tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): sequence with the letters of
+            all sequences, one after the other. The pointers are not changed, so they still refer to each letter's own
+            trip.
+        """
+        return cls(
+            np.concatenate([seq.starts for seq in letter_seq_list]),
+            np.concatenate([seq.ends for seq in letter_seq_list]),
+            np.concatenate([seq.codes for seq in letter_seq_list]),
+            letter_seq_list[0].letter_size,
+            letter_seq_list[0].alphabet_size,
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def get_ndim(self):
+        return self.codes.shape[1]
+
+    def get_bounds(self, letter_index):
+        """
+        Args:
+            letter_index (int): index of the letter in the sequence.
+
+        Returns:
+            start (int): pointer to the first observation of the letter.
+            end (int): pointer to the observation right after the last one of the letter.
+        """
+        return int(self.starts[letter_index]), int(self.ends[letter_index])
+
+    def get_letter_lengths(self):
+        """
+        Returns:
+            letter_lengths (numpy.array): number of pointers of each letter, as in `VSaxLetter.get_pointers`. A letter
+            that merges n windows has n * letter_size pointers, since the windows overlap.
+        """
+        return (self.ends - self.starts - self.letter_size + 1) * self.letter_size
+
+    def get_str_rep(self, letter_index):
+        """
+        Args:
+            letter_index (int): index of the letter in the sequence.
+
+        Returns:
+            str_rep (tuple of str): string representation of the letter, with a 1-dim letter per signal.
+        """
+        return tuple(idx2letter(code) for code in self.codes[letter_index].tolist())
+
+    def get_letter(self, letter_index, cuts=None):
+        """
+        Args:
+            letter_index (int): index of the letter in the sequence.
+            cuts (dict of numpy.array): vsax cuts used to compute the letters. It defaults to None.
+
+        Returns:
+            vsax_letter (tripMD.vsax.objects.vsax_letter.VSaxLetter): the letter as a VSaxLetter object, with the same
+            pointers as the concatenation of the letters of each of its windows.
+        """
+        start, end = self.get_bounds(letter_index)
+        # the pointers of the last window come first, as in the concatenation of the windows' letters
+        window_starts = np.arange(end - self.letter_size, start - 1, -1)
+        letter_pointers = (
+            (window_starts[:, None] + np.arange(self.letter_size)).ravel().tolist()
+        )
+        return VSaxLetter.from_str_rep(
+            self.get_str_rep(letter_index), letter_pointers, cuts
+        )
@@ -1,6 +1,9 @@
-from tripMD.vsax import compute_cuts
-from tripMD.vsax.objects.vsax_letter import VSaxLetter
-from tripMD.vsax.objects.vsax_word import VSaxWord
+import numpy as np
+from tripMD.vsax import alphabet, compute_cuts, compute_letters
+from tripMD.vsax.pattern_count import find_candidate_repeated_words
+from tripMD.vsax.suffix_array import LetterSuffixArray
+from tripMD.vsax.objects.vsax_letter_sequence import VSaxLetterSequence
+from tripMD.vsax.objects.vsax_word_table import VSaxWordTable
 
 
 class VSaxSequence(object):
@@ -10,35 +13,111 @@ class VSaxSequence(object):
 
     Args:
         trip_list (list of tripMD.objects.trip.Trip): list of trip objects with the trips that should be used to build
-        the variable sax sequence.
+        the variable sax sequence. It can also be a tripMD.objects.trip_store.TripStore, in which case the trips are
+        read from disk on demand.
         default_letter_size (int): minimum number of observations that build a single variable sax letter. Each letter
         will correspond to an segment of this size or bigger in the original trip recordings.
+        vsax_cuts (dict of numpy.array): dictionary with the vsax cuts of each dimension (e.g., taken from
+        tripMD.vsax.objects.vsax_cuts.VSaxCuts). It defaults to None, in which case the cuts are computed from
+        trip_list.
 
     Attributes:
         trip_list (list of tripMD.objects.trip.Trip): list of trip objects from which the variable sax sequence was built.
         n_trips (int): number of trips in the sequence
         default_letter_size (int): minimum number of observations that build a single variable sax letter. Each letter
         will correspond to an segment of this size or bigger in the original trip recordings.
-        letter_seq_list (list of list): list of sequences of variable sax letters. This list includes a sequence per trip
-        and, for each trip, the sequence includes that entire trip converted to a list of variable sax letters.
+        vsax_cuts (dict of numpy.array): dictionary with the vsax cuts used to compute the letters.
+        alphabet_size (int): number of symbols of the 1-dim letters, which is used to encode the letters as ints.
+        letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): list of sequences of
+        variable sax letters. This list includes a sequence per trip and, for each trip, the sequence includes that
+        entire trip converted to variable sax letters, stored as run-length encoded arrays.
     """
 
-    def __init__(self, trip_list, default_letter_size):
+    def __init__(self, trip_list, default_letter_size, vsax_cuts=None):
         """
         Constructor for the VSaxSequence class.
 
         Args:
             trip_list (list of tripMD.objects.trip.Trip): list of trip objects with the trips that should be used to build
-            the variable sax sequence.
+            the variable sax sequence. It can also be a tripMD.objects.trip_store.TripStore.
             default_letter_size (int): minimum number of observations that build a single variable sax letter. Each letter
             will correspond to an segment of this size or bigger in the original trip recordings.
+            vsax_cuts (dict of numpy.array): dictionary with the vsax cuts of each dimension. It defaults to None, in
+            which case the cuts are computed from trip_list.
         """
         self.trip_list = trip_list
         self.n_trips = len(trip_list)
         self.default_letter_size = default_letter_size
+        if vsax_cuts is None:
+            vsax_cuts = compute_cuts.compute_vsax_cuts(trip_list)
+        self.vsax_cuts = vsax_cuts
+        self.alphabet_size = alphabet.get_alphabet_size(vsax_cuts)
         self.letter_seq_list = self._compute_letter_sequence_list(
             trip_list, default_letter_size
         )
+        self._letter_index = None
+        self._all_letters = None
+
+    def add_trips(self, new_trip_list, vsax_cuts, tolerance=0.0):
+        """
+        Adds new trips to the sequence, updating the cuts incrementally. The new trips are added to the cuts' statistics
+        and, if the cuts drift at most `tolerance`, all the letter sequences computed so far are reused. Otherwise, the
+        letters are only recomputed for the trips where some letter would actually change with the new cuts.
+
+        Args:
+            new_trip_list (list of tripMD.objects.trip.Trip): list with the new trips.
+            vsax_cuts (tripMD.vsax.objects.vsax_cuts.VSaxCuts): incremental cuts with the statistics of the trips
+            already in the sequence and whose cuts are the ones in use by the sequence (e.g., create the sequence with
+            `VSaxSequence(trip_list, default_letter_size, vsax_cuts.get_cuts())`). An exception is raised otherwise.
+            tolerance (float): maximum drift of the cuts (in the units of the signals) for which the current cuts are
+            kept.
+
+        Returns:
+            drift_dict (dict of numpy.array): dictionary where the keys are the trips' dimensions and the values are the
+            absolute differences between the updated cuts and the cuts in use before the update.
+            recomputed_trip_indices (list of int): indices of the trips (already in the sequence) whose letters were
+            recomputed.
+        """
+        if not self._cuts_in_use(vsax_cuts.get_cuts()):
+            raise Exception(
+                "The cuts of vsax_cuts are not the ones in use by the sequence. Build the sequence with"
+                " vsax_cuts.get_cuts() before adding trips incrementally"
+            )
+        old_cuts = self.vsax_cuts
+        drift_dict, cuts_changed = vsax_cuts.update(new_trip_list, tolerance)
+        self.vsax_cuts = vsax_cuts.get_cuts()
+        recomputed_trip_indices = []
+        if cuts_changed:
+            for trip_index in self.trip_indices():
+                trip = self.get_trip(trip_index)
+                if compute_letters.cuts_changed_for_trip(
+                    trip.get_obs_array(),
+                    self.default_letter_size,
+                    old_cuts,
+                    self.vsax_cuts,
+                ):
+                    trip_letter_sequence = self._compute_letter_sequence_from_trip(
+                        trip, self.default_letter_size, self.vsax_cuts
+                    )
+                    self.letter_seq_list[trip_index] = trip_letter_sequence
+                    recomputed_trip_indices.append(trip_index)
+        for trip in new_trip_list:
+            trip_letter_sequence = self._compute_letter_sequence_from_trip(
+                trip, self.default_letter_size, self.vsax_cuts
+            )
+            self.letter_seq_list.append(trip_letter_sequence)
+        self.trip_list = list(self.trip_list) + list(new_trip_list)
+        self.n_trips = len(self.trip_list)
+        self._letter_index = None
+        self._all_letters = None
+        return drift_dict, recomputed_trip_indices
+
+    def _cuts_in_use(self, cuts_dict):
+        if set(cuts_dict.keys()) != set(self.vsax_cuts.keys()):
+            return False
+        return all(
+            np.array_equal(cuts_dict[dim], self.vsax_cuts[dim]) for dim in cuts_dict
+        )
 
     def trip_indices(self):
         return list(range(self.n_trips))
@@ -49,57 +128,146 @@ class VSaxSequence(object):
     def get_trip(self, trip_index):
         return self.trip_list[trip_index]
 
-    def get_word_list(self, word_size):
-        word_list = []
-        for trip_index in self.trip_indices():
-            trip_word_list = self._compute_word_sequence_from_trip(
-                word_size, trip_index
+    def decode_pattern(self, pattern):
+        """
+        Args:
+            pattern (tuple of int): integer representation of a vsax word of the sequence (see `VSaxWord.get_pattern`).
+
+        Returns:
+            str_rep (tuple of str): string representation of the pattern, with a 1-dim word per signal.
+        """
+        n_dim = len(self.vsax_cuts)
+        return alphabet.decode_pattern(pattern, n_dim, self.alphabet_size)
+
+    def get_word_table(self, word_size, trip_index=None, first_letter=None):
+        """
+        Args:
+            word_size (int): number of letters in each word.
+            trip_index (numpy.array): trip of each word of the table. It defaults to None, in which case the table has
+            all the words of size word_size of all trips.
+            first_letter (numpy.array): index of the first letter of each word of the table in its trip's letter
+            sequence. The words must be sorted by trip and first letter.
+
+        Returns:
+            word_table (tripMD.vsax.objects.vsax_word_table.VSaxWordTable): table with the words of size word_size.
+        """
+        n_letters, _, _ = self._get_letter_index()
+        return VSaxWordTable(
+            self.letter_seq_list,
+            word_size,
+            trip_index,
+            first_letter,
+            letters=self._get_all_letters(),
+            n_letters=n_letters,
+        )
+
+    def get_repeated_word_table(self, word_size, sketch_width=None):
+        """
+        Builds the table with only the words whose pattern repeats, without building the table of all words first: the
+        patterns are counted by hash in a first pass and only the words whose hash repeats are read in a second pass
+        (see tripMD.vsax.pattern_count.find_candidate_repeated_words).
+
+        Args:
+            word_size (int): number of letters in each word.
+            sketch_width (int): number of counters of each row of the count-min sketch used to count the patterns. It
+            defaults to None, in which case the patterns are counted exactly.
+
+        Returns:
+            word_table (tripMD.vsax.objects.vsax_word_table.VSaxWordTable): table with the words of size word_size
+            whose pattern appears more than once.
+        """
+        trip_index, first_letter = find_candidate_repeated_words(
+            self.letter_seq_list, word_size, sketch_width
+        )
+        word_table = self.get_word_table(word_size, trip_index, first_letter)
+        return word_table.get_repeated_words()
+
+    def get_suffix_array(self):
+        """
+        Returns:
+            suffix_array (tripMD.vsax.suffix_array.LetterSuffixArray): generalized suffix array of the letters of all
+            trips.
+        """
+        return LetterSuffixArray(self.letter_seq_list)
+
+    def get_n_words(self, word_size):
+        """
+        Args:
+            word_size (int): number of letters in each word.
+
+        Returns:
+            n_words (int): number of words of size word_size in all trips.
+        """
+        n_letters, _, _ = self._get_letter_index()
+        return int(np.sum(np.maximum(n_letters - word_size + 1, 0)))
+
+    def get_flat_word_lengths(self, word_size, start_word_index, end_word_index):
+        """
+        Args:
+            word_size (int): number of letters in each word.
+            start_word_index (int): index of the first word in the list of all words of size word_size.
+            end_word_index (int): index right after the last word in the list of all words of size word_size.
+
+        Returns:
+            word_lengths (list of int): concatenation of the lengths of the letters (see `VSaxWord.get_word_lengths`)
+            of the words from start_word_index to end_word_index (exclusive), in the order of `get_word_list`.
+        """
+        n_letters, letter_offsets, letter_lengths = self._get_letter_index()
+        n_words = np.maximum(n_letters - word_size + 1, 0)
+        word_offsets = np.concatenate(([0], np.cumsum(n_words)))
+        word_index = np.arange(start_word_index, end_word_index)
+        trip_index = np.searchsorted(word_offsets, word_index, side="right") - 1
+        first_letter = (
+            letter_offsets[trip_index] + word_index - word_offsets[trip_index]
+        )
+        letter_index = first_letter[:, None] + np.arange(word_size)
+        return letter_lengths[letter_index.ravel()].tolist()
+
+    def _get_letter_index(self):
+        # number of letters of each trip, offsets of each trip in the concatenation of all letters and the lengths of
+        # all letters, which are computed once and reused for all word sizes (e.g., by the MDL cost of each motif)
+        if self._letter_index is None:
+            n_letters = np.array([len(seq) for seq in self.letter_seq_list])
+            letter_offsets = np.concatenate(([0], np.cumsum(n_letters)))
+            letter_lengths = np.concatenate(
+                [seq.get_letter_lengths() for seq in self.letter_seq_list]
             )
-            word_list = word_list + trip_word_list
-        return word_list
+            self._letter_index = (n_letters, letter_offsets, letter_lengths)
+        return self._letter_index
+
+    def _get_all_letters(self):
+        # letters of all trips concatenated, which are shared by the word tables of all word sizes instead of being
+        # concatenated again for each one
+        if self._all_letters is None:
+            self._all_letters = VSaxLetterSequence.concatenate(self.letter_seq_list)
+        return self._all_letters
+
+    def get_word_list(self, word_size):
+        return self.get_word_table(word_size).get_word_list()
 
     def get_word_obs(self, vsax_word):
-        pointers = vsax_word.get_pointers()
+        start, end = vsax_word.get_bounds()
         trip_index = vsax_word.get_trip_index()
         trip = self.get_trip(trip_index)
-        word_obs = trip.get_windown_obs(pointers)
+        word_obs = trip.get_window_view(start, end)
         return word_obs
 
     def _compute_letter_sequence_list(self, trip_list, default_letter_size):
-        vsax_cuts = compute_cuts.compute_vsax_cuts(trip_list)
         letter_sequence_list = []
         for trip in trip_list:
-            trip_letter_list = self._compute_letter_sequence_from_trip(
-                trip, default_letter_size, vsax_cuts
+            trip_letter_sequence = self._compute_letter_sequence_from_trip(
+                trip, default_letter_size, self.vsax_cuts
             )
-            letter_sequence_list.append(trip_letter_list)
+            letter_sequence_list.append(trip_letter_sequence)
         return letter_sequence_list
 
     @staticmethod
     def _compute_letter_sequence_from_trip(trip, default_letter_size, vsax_cuts):
-        letter_list = []
-        trip_len = trip.get_trip_size()
-        for t in range(0, trip_len - default_letter_size + 1):
-            segment_pointers = list(range(t, t + default_letter_size))
-            segment_ts = trip.get_windown_obs(segment_pointers)
-            current_letter = VSaxLetter(segment_ts, segment_pointers, vsax_cuts)
-            if len(letter_list) == 0:
-                letter_list.append(current_letter)
-            else:
-                previous_letter = letter_list[-1]
-                if previous_letter.get_str_rep() == current_letter.get_str_rep():
-                    concat_letter = current_letter.concat_with(previous_letter)
-                    letter_list[-1] = concat_letter
-                else:
-                    letter_list.append(current_letter)
-        return letter_list
-
-    def _compute_word_sequence_from_trip(self, word_size, trip_index):
-        letter_sequence = self.trip_letters(trip_index)
-        word_list = []
-        letter_sequence_len = len(letter_sequence)
-        for t in range(0, letter_sequence_len - word_size + 1):
-            letter_subseq = letter_sequence[t : t + word_size]
-            vsax_word = VSaxWord(letter_subseq, trip_index)
-            word_list.append(vsax_word)
-        return word_list
+        # the symbols of all sliding windows are computed at once and runs of windows with the same symbols are merged
+        # into a single letter, exactly as concatenating the letters of each window with `VSaxLetter.concat_with`
+        letter_codes = compute_letters.compute_letter_codes(
+            trip.get_obs_array(), default_letter_size, vsax_cuts
+        )
+        return VSaxLetterSequence.from_window_codes(
+            letter_codes, default_letter_size, alphabet.get_alphabet_size(vsax_cuts)
+        )
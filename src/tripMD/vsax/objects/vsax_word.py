@@ -1,3 +1,6 @@
+from tripMD.vsax import alphabet
+
+
 class VSaxWord(object):
     """
     Object for the words of the variable sax representation. In short, a variable sax word results from a union of variable
@@ -13,12 +16,20 @@ class VSaxWord(object):
         constructor).
         _ndim (int): number of dimensions of the word, which correspond to the number of signals that make the
         multidimensional trip from wich the segment was taken.
+        _start (int): pointer to the first observation of the word in the original trip.
+        _end (int): pointer to the observation right after the last one of the word in the original trip.
         _pointers (int): list with the indices of the word in the original trip.
+        _alphabet_size (int): number of symbols of the 1-dim letters.
+        _pattern (tuple of int): integer representation of the word, with the code of each of its letters (see
+        tripMD.vsax.alphabet). Two words have the same pattern if and only if they have the same string representation.
         _rep (tuple of str): string representation of the word. For each signal in the multidimensional segment, a word
         is computed (as a concatenation of the respective 1-dim letters) and added to the tuple. Thus, each entry
-        in the tuple corresponds to a single signal from the multidimensional trip's segment.
+        in the tuple corresponds to a single signal from the multidimensional trip's segment. It is only decoded from
+        the pattern when requested.
         _word_lengths (list of int): list with the length of the each letter in the word. In other words, it is a list
         with the number of pointers of each letter in the word.
+        _word_index (int): index of the word in the list of all words of the same size, when the word was read from a
+        word table (see tripMD.vsax.objects.vsax_word_table.VSaxWordTable). Otherwise, it is None.
     """
 
     def __init__(self, vsax_letter_list, trip_index):
@@ -34,7 +45,86 @@ class VSaxWord(object):
         self._init_ndim(vsax_letter_list)
         self._init_pointers(vsax_letter_list)
         self._init_str_rep(vsax_letter_list)
+        self._init_pattern(vsax_letter_list)
         self._init_word_lengths(vsax_letter_list)
+        self._word_index = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        trip_index,
+        start,
+        end,
+        pattern,
+        word_lengths,
+        n_dim,
+        alphabet_size,
+        word_index=None,
+    ):
+        """
+        Alternative constructor for the VSaxWord class, for words read from the arrays of a letter sequence or a row of
+        a tripMD.vsax.objects.vsax_word_table.VSaxWordTable. The word only keeps a few scalars and its pointers and
+        string representation are computed when requested.
+
+        Args:
+            trip_index (int): index to the trip from which the letters were built.
+            start (int): pointer to the first observation of the word in the original trip.
+            end (int): pointer to the observation right after the last one of the word in the original trip.
+            pattern (tuple of int): integer representation of the word, with the code of each of its letters.
+            word_lengths (list of int): number of pointers of each letter in the word.
+            n_dim (int): number of dimensions of the word.
+            alphabet_size (int): number of symbols of the 1-dim letters.
+            word_index (int): index of the word in the list of all words of the same size (i.e. its row in the word
+            table). It defaults to None.
+
+        Returns:
+            vsax_word (tripMD.vsax.objects.vsax_word.VSaxWord): the word.
+        """
+        vsax_word = cls.__new__(cls)
+        vsax_word._trip_index = trip_index
+        vsax_word._ndim = n_dim
+        vsax_word._start = start
+        vsax_word._end = end
+        vsax_word._pointers = None
+        vsax_word._alphabet_size = alphabet_size
+        vsax_word._pattern = pattern
+        vsax_word._rep = None
+        vsax_word._word_lengths = word_lengths
+        vsax_word._word_index = word_index
+        return vsax_word
+
+    @classmethod
+    def from_letter_sequence(
+        cls, letter_sequence, first_letter_index, word_size, trip_index
+    ):
+        """
+        Alternative constructor for the VSaxWord class, which reads the letters directly from the run-length encoded
+        arrays of a trip's letter sequence. The resulting word is the same as the one built from the list of
+        VSaxLetter objects.
+
+        Args:
+            letter_sequence (tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of the trip.
+            first_letter_index (int): index of the word's first letter in letter_sequence.
+            word_size (int): number of letters in the word.
+            trip_index (int): index to the trip from which the letters were built.
+
+        Returns:
+            vsax_word (tripMD.vsax.objects.vsax_word.VSaxWord): the word.
+        """
+        last_letter_index = first_letter_index + word_size
+        return cls.from_arrays(
+            trip_index,
+            int(letter_sequence.starts[first_letter_index]),
+            int(letter_sequence.ends[last_letter_index - 1]),
+            tuple(
+                letter_sequence.letters[first_letter_index:last_letter_index].tolist()
+            ),
+            letter_sequence.get_letter_lengths()[
+                first_letter_index:last_letter_index
+            ].tolist(),
+            letter_sequence.get_ndim(),
+            letter_sequence.alphabet_size,
+        )
 
     def _init_ndim(self, vsax_letter_list):
         ndim_list = [vsax_letter.get_ndim() for vsax_letter in vsax_letter_list]
@@ -51,6 +141,8 @@ class VSaxWord(object):
             letter_pointers = vsax_letter.get_pointers()
             pointers_list = pointers_list + letter_pointers
         self._pointers = sorted(set(pointers_list))
+        self._start = self._pointers[0]
+        self._end = self._pointers[-1] + 1
 
     def _init_str_rep(self, vsax_letter_list):
         word_list = []
@@ -62,6 +154,10 @@ class VSaxWord(object):
             word_list.append(word)
         self._rep = tuple(word_list)
 
+    def _init_pattern(self, vsax_letter_list):
+        self._alphabet_size = alphabet.get_alphabet_size(vsax_letter_list[0].get_cuts())
+        self._pattern = alphabet.encode_str_rep(self._rep, self._alphabet_size)
+
     def _init_word_lengths(self, vsax_letter_list):
         self._word_lengths = []
         for letter in vsax_letter_list:
@@ -69,13 +165,34 @@ class VSaxWord(object):
             self._word_lengths.append(letter_length)
 
     def get_pointers(self):
+        if self._pointers is None:
+            # the letters of a word are consecutive, so its pointers are always a contiguous range
+            self._pointers = list(range(self._start, self._end))
         return self._pointers
 
+    def get_bounds(self):
+        """
+        Returns:
+            start (int): pointer to the first observation of the word in the original trip.
+            end (int): pointer to the observation right after the last one of the word in the original trip.
+        """
+        return self._start, self._end
+
     def get_trip_index(self):
         return self._trip_index
 
+    def get_pattern(self):
+        return self._pattern
+
     def get_str_rep(self):
+        if self._rep is None:
+            self._rep = alphabet.decode_pattern(
+                self._pattern, self._ndim, self._alphabet_size
+            )
         return self._rep
 
     def get_word_lengths(self):
         return self._word_lengths
+
+    def get_word_index(self):
+        return self._word_index
@@ -0,0 +1,241 @@
+import numpy as np
+from tripMD.vsax.objects.vsax_letter_sequence import VSaxLetterSequence
+from tripMD.vsax.objects.vsax_word import VSaxWord
+
+
+class VSaxWordTable(object):
+    """
+    Columnar table with variable sax words of a given size from a vsax sequence. Each row is a word and, instead of one
+    object per word, the words are kept as a few arrays computed at once from the letter sequences of all trips. The
+    rows are ordered by trip and, inside each trip, by the position of the word's first letter, which is the same order
+    of `VSaxSequence.get_word_list`. The words can still be read as tripMD.vsax.objects.vsax_word.VSaxWord objects with
+    `get_word` and `get_word_list`.
+
+    By default, a table has all the words of the given size. Tables with only some of them are built by providing the
+    rows or derived from another table with `get_repeated_words` and `get_extended_words`, which allows going through
+    the word sizes Apriori-style: a pattern of size word_size + 1 can only repeat if its prefix of size word_size also
+    repeats.
+
+    Args:
+        letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of each trip.
+        word_size (int): number of letters in each word.
+        trip_index (numpy.array): trip of each word of the table. It defaults to None, in which case the table has all
+        the words of size word_size.
+        first_letter (numpy.array): index of the first letter of each word of the table in its trip's letter sequence.
+        It must be provided together with trip_index and the words must be sorted by trip and first letter.
+        letters (tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of all trips concatenated (see
+        `VSaxLetterSequence.concatenate`). It defaults to None, in which case they are concatenated from letter_seq_list.
+        n_letters (numpy.array): number of letters of each trip. It defaults to None, in which case it is taken from
+        letter_seq_list.
+
+    Attributes:
+        word_size (int): number of letters in each word.
+        n_dim (int): number of dimensions of the letters.
+        alphabet_size (int): number of symbols of the 1-dim letters.
+        trip_index (numpy.array): index of the trip of each word.
+        first_letter (numpy.array): index of the first letter of each word in its trip's letter sequence.
+        start (numpy.array): pointer to the first observation of each word in its trip.
+        end (numpy.array): pointer to the observation right after the last one of each word in its trip.
+        word_index (numpy.array): index of each word in the list of all words of size word_size. It is equal to the row
+        in tables with all the words.
+        pattern_id (numpy.array): index of the pattern of each word in patterns.
+        patterns (numpy.array): array of shape (n_patterns, word_size) with the distinct patterns of the words (i.e.
+        the codes of their letters), sorted lexicographically.
+    """
+
+    def __init__(
+        self,
+        letter_seq_list,
+        word_size,
+        trip_index=None,
+        first_letter=None,
+        letters=None,
+        n_letters=None,
+    ):
+        """
+        Constructor for the VSaxWordTable class.
+
+        Args:
+            letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of each
+            trip.
+            word_size (int): number of letters in each word.
+            trip_index (numpy.array): trip of each word of the table. It defaults to None, in which case the table has
+            all the words of size word_size.
+            first_letter (numpy.array): index of the first letter of each word of the table in its trip's letter
+            sequence.
+            letters (tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of all trips concatenated.
+            n_letters (numpy.array): number of letters of each trip.
+        """
+        if letters is None:
+            letters = VSaxLetterSequence.concatenate(letter_seq_list)
+        if n_letters is None:
+            n_letters = [len(seq) for seq in letter_seq_list]
+        self._letters = letters
+        self._n_letters = np.asarray(n_letters, dtype=np.int64)
+        self._letter_offsets = np.concatenate(([0], np.cumsum(self._n_letters)))
+        self.n_dim = self._letters.get_ndim()
+        self.alphabet_size = self._letters.alphabet_size
+        if trip_index is None:
+            n_words = np.maximum(self._n_letters - word_size + 1, 0)
+            word_offsets = np.concatenate(([0], np.cumsum(n_words)))
+            trip_index = np.repeat(np.arange(len(letter_seq_list)), n_words)
+            first_letter = np.arange(word_offsets[-1]) - np.repeat(
+                word_offsets[:-1], n_words
+            )
+        self._init_rows(word_size, trip_index, first_letter)
+        letter_index = self._global_first_letter[:, None] + np.arange(word_size)
+        self.patterns, pattern_id = np.unique(
+            self._letters.letters[letter_index].reshape(-1, word_size),
+            axis=0,
+            return_inverse=True,
+        )
+        self.pattern_id = pattern_id.reshape(-1)
+
+    def _init_rows(self, word_size, trip_index, first_letter):
+        self.word_size = word_size
+        self.trip_index = trip_index
+        self.first_letter = first_letter
+        # index of each word's first letter in the letters of all trips concatenated
+        self._global_first_letter = self._letter_offsets[trip_index] + first_letter
+        self.start = self._letters.starts[self._global_first_letter]
+        self.end = self._letters.ends[self._global_first_letter + word_size - 1]
+        n_words = np.maximum(self._n_letters - word_size + 1, 0)
+        word_offsets = np.concatenate(([0], np.cumsum(n_words)))
+        self.word_index = word_offsets[trip_index] + first_letter
+
+    def _derive_table(self, rows, word_size):
+        word_table = VSaxWordTable.__new__(VSaxWordTable)
+        word_table._letters = self._letters
+        word_table._n_letters = self._n_letters
+        word_table._letter_offsets = self._letter_offsets
+        word_table.n_dim = self.n_dim
+        word_table.alphabet_size = self.alphabet_size
+        word_table._init_rows(word_size, self.trip_index[rows], self.first_letter[rows])
+        return word_table
+
+    def __len__(self):
+        return len(self.trip_index)
+
+    def get_n_patterns(self):
+        """
+        Returns:
+            n_patterns (int): number of distinct patterns in the table.
+        """
+        return len(self.patterns)
+
+    def get_pattern(self, pattern_id):
+        """
+        Args:
+            pattern_id (int): index of the pattern.
+
+        Returns:
+            pattern (tuple of int): integer representation of the pattern (see `VSaxWord.get_pattern`).
+        """
+        return tuple(self.patterns[pattern_id].tolist())
+
+    def get_pattern_counts(self):
+        """
+        Returns:
+            pattern_counts (numpy.array): number of words with each pattern.
+        """
+        return np.bincount(self.pattern_id, minlength=self.get_n_patterns())
+
+    def get_pattern_rows(self):
+        """
+        Returns:
+            pattern_rows (list of numpy.array): inverted index from patterns to words. The i-th array has the rows of
+            the words with the i-th pattern, in increasing order.
+        """
+        sorted_rows = np.argsort(self.pattern_id, kind="stable")
+        return np.split(sorted_rows, np.cumsum(self.get_pattern_counts())[:-1])
+
+    def get_repeated_words(self):
+        """
+        Returns:
+            word_table (tripMD.vsax.objects.vsax_word_table.VSaxWordTable): table with only the words whose pattern
+            appears more than once.
+        """
+        is_repeated_pattern = self.get_pattern_counts() >= 2
+        rows = np.flatnonzero(is_repeated_pattern[self.pattern_id])
+        word_table = self._derive_table(rows, self.word_size)
+        new_pattern_id = np.cumsum(is_repeated_pattern) - 1
+        word_table.patterns = self.patterns[is_repeated_pattern]
+        word_table.pattern_id = new_pattern_id[self.pattern_id[rows]]
+        return word_table
+
+    def get_extended_words(self):
+        """
+        Returns:
+            word_table (tripMD.vsax.objects.vsax_word_table.VSaxWordTable): table with the words of size word_size + 1
+            that start with the words of this table (i.e. each word extended with the next letter of its trip). Words
+            at the end of their trip have no extension.
+        """
+        has_next_letter = (
+            self.first_letter + self.word_size < self._n_letters[self.trip_index]
+        )
+        rows = np.flatnonzero(has_next_letter)
+        word_table = self._derive_table(rows, self.word_size + 1)
+        next_letters = self._letters.letters[
+            self._global_first_letter[rows] + self.word_size
+        ]
+        # the prefixes are sorted lexicographically, so sorting the pairs (prefix, next letter) keeps the new patterns
+        # sorted as well
+        prefix_next_pairs, pattern_id = np.unique(
+            np.column_stack((self.pattern_id[rows], next_letters)).reshape(-1, 2),
+            axis=0,
+            return_inverse=True,
+        )
+        word_table.patterns = np.column_stack(
+            (self.patterns[prefix_next_pairs[:, 0]], prefix_next_pairs[:, 1])
+        ).reshape(-1, self.word_size + 1)
+        word_table.pattern_id = pattern_id.reshape(-1)
+        return word_table
+
+    def get_word(self, row):
+        """
+        Args:
+            row (int): index of the word in the table.
+
+        Returns:
+            vsax_word (tripMD.vsax.objects.vsax_word.VSaxWord): the word in that row.
+        """
+        letter_index = self._global_first_letter[row] + np.arange(self.word_size)
+        return VSaxWord.from_arrays(
+            int(self.trip_index[row]),
+            int(self.start[row]),
+            int(self.end[row]),
+            self.get_pattern(self.pattern_id[row]),
+            self._letters.get_letter_lengths()[letter_index].tolist(),
+            self.n_dim,
+            self.alphabet_size,
+            int(self.word_index[row]),
+        )
+
+    def get_word_list(self):
+        """
+        Returns:
+            word_list (list of tripMD.vsax.objects.vsax_word.VSaxWord): list with the words of all rows of the table.
+        """
+        letter_index = self._global_first_letter[:, None] + np.arange(self.word_size)
+        pattern_list = [tuple(pattern) for pattern in self.patterns.tolist()]
+        word_list = []
+        for trip_index, start, end, pattern_id, word_lengths, word_index in zip(
+            self.trip_index.tolist(),
+            self.start.tolist(),
+            self.end.tolist(),
+            self.pattern_id.tolist(),
+            self._letters.get_letter_lengths()[letter_index].tolist(),
+            self.word_index.tolist(),
+        ):
+            vsax_word = VSaxWord.from_arrays(
+                trip_index,
+                start,
+                end,
+                pattern_list[pattern_id],
+                word_lengths,
+                self.n_dim,
+                self.alphabet_size,
+                word_index,
+            )
+            word_list.append(vsax_word)
+        return word_list
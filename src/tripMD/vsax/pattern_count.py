@@ -0,0 +1,182 @@
+import numpy as np
+
+HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+HASH_BATCH_SIZE = 1000000
+
+
+def compute_word_hashes(letters, word_size):
+    """
+    This function computes a 64-bit polynomial hash of every word of a trip's letter sequence at once. Equal words
+    always have the same hash, while different words only collide with a negligible probability.
+
+    Args:
+        letters (numpy.array): integer letters of the trip (see `VSaxLetterSequence.letters`).
+        word_size (int): number of letters in each word.
+
+    Returns:
+        word_hashes (numpy.array): array of uint64 with the hash of the word that starts at each letter.
+    """
+    n_words = max(len(letters) - word_size + 1, 0)
+    word_letters = np.asarray(letters).astype(np.uint64) + np.uint64(1)
+    word_hashes = np.zeros(n_words, dtype=np.uint64)
+    for i in range(word_size):
+        # the products overflow on purpose, so that the hashes are computed modulo 2^64
+        word_hashes = word_hashes * HASH_BASE + word_letters[i : i + n_words]
+    return word_hashes
+
+
+class CountMinSketch(object):
+    """
+    Count-min sketch of a stream of 64-bit hashes, which estimates the number of times each hash was added with a fixed
+    amount of memory. The estimated counts are never lower than the real ones, so a word whose estimated count is lower
+    than 2 certainly does not repeat.
+
+    Args:
+        width (int): number of counters in each row. It is rounded up to a power of 2.
+        depth (int): number of rows, each one with an independent hash function.
+        seed (int): seed of the hash functions.
+
+    Attributes:
+        width (int): number of counters in each row.
+        depth (int): number of rows.
+        counts (numpy.array): array of shape (depth, width) with the counters, which saturate at 255.
+    """
+
+    def __init__(self, width, depth=4, seed=0):
+        """
+        Constructor for the CountMinSketch class.
+
+        Args:
+            width (int): number of counters in each row. It is rounded up to a power of 2.
+            depth (int): number of rows, each one with an independent hash function.
+            seed (int): seed of the hash functions.
+        """
+        self._n_bits = max(int(np.ceil(np.log2(width))), 1)
+        self.width = 2**self._n_bits
+        self.depth = depth
+        self.counts = np.zeros((depth, self.width), dtype=np.uint8)
+        rng = np.random.default_rng(seed)
+        # odd multipliers of the multiply-shift hash functions
+        self._multipliers = (
+            rng.integers(0, 2**63, size=depth, dtype=np.uint64) * np.uint64(2)
+        ) + np.uint64(1)
+
+    def _get_columns(self, row, hashes):
+        return (hashes * self._multipliers[row]) >> np.uint64(64 - self._n_bits)
+
+    def add(self, hashes):
+        """
+        Args:
+            hashes (numpy.array): array of uint64 with the hashes to count.
+        """
+        for row in range(self.depth):
+            columns, column_counts = np.unique(
+                self._get_columns(row, hashes), return_counts=True
+            )
+            row_counts = self.counts[row, columns].astype(np.int64) + column_counts
+            self.counts[row, columns] = np.minimum(row_counts, 255)
+
+    def get_counts(self, hashes):
+        """
+        Args:
+            hashes (numpy.array): array of uint64 with the hashes to look up.
+
+        Returns:
+            counts (numpy.array): estimated number of times each hash was added.
+        """
+        counts = np.full(len(hashes), 255, dtype=np.uint8)
+        for row in range(self.depth):
+            counts = np.minimum(
+                counts, self.counts[row, self._get_columns(row, hashes)]
+            )
+        return counts
+
+
+class HashCounter(object):
+    """
+    Exact counter of a stream of 64-bit hashes. The distinct hashes are kept in a sorted array with their counts
+    (which saturate at 2, since only knowing if a word repeats is needed), and the added hashes are merged in batches.
+    """
+
+    def __init__(self):
+        """
+        Constructor for the HashCounter class.
+        """
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._counts = np.zeros(0, dtype=np.uint8)
+        self._batch = []
+        self._batch_size = 0
+
+    def add(self, hashes):
+        """
+        Args:
+            hashes (numpy.array): array of uint64 with the hashes to count.
+        """
+        self._batch.append(hashes)
+        self._batch_size += len(hashes)
+        if self._batch_size >= HASH_BATCH_SIZE:
+            self._merge_batch()
+
+    def _merge_batch(self):
+        if len(self._batch) == 0:
+            return
+        all_hashes = np.concatenate([self._hashes] + self._batch)
+        all_counts = np.concatenate(
+            [self._counts]
+            + [np.ones(len(hashes), dtype=np.uint8) for hashes in self._batch]
+        )
+        self._hashes, inverse = np.unique(all_hashes, return_inverse=True)
+        counts = np.bincount(inverse.reshape(-1), weights=all_counts)
+        self._counts = np.minimum(counts, 2).astype(np.uint8)
+        self._batch = []
+        self._batch_size = 0
+
+    def get_counts(self, hashes):
+        """
+        Args:
+            hashes (numpy.array): array of uint64 with the hashes to look up.
+
+        Returns:
+            counts (numpy.array): number of times each hash was added (at most 2).
+        """
+        self._merge_batch()
+        if len(self._hashes) == 0:
+            return np.zeros(len(hashes), dtype=np.uint8)
+        index = np.minimum(np.searchsorted(self._hashes, hashes), len(self._hashes) - 1)
+        is_found = self._hashes[index] == hashes
+        return np.where(is_found, self._counts[index], 0).astype(np.uint8)
+
+
+def find_candidate_repeated_words(letter_seq_list, word_size, sketch_width=None):
+    """
+    This function finds the words that may have a repeating pattern without building all the words. It makes two
+    passes over the letter sequences: the first one counts the hashes of all words (exactly or with a count-min sketch)
+    and the second one keeps the words whose hash was counted at least twice. Hash collisions can only add words whose
+    pattern does not actually repeat, so the result always includes all the words with a repeating pattern and the
+    exact ones are then selected with `VSaxWordTable.get_repeated_words`.
+
+    Args:
+        letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of each trip.
+        word_size (int): number of letters in each word.
+        sketch_width (int): number of counters of each row of the count-min sketch. It defaults to None, in which case
+        the hashes are counted exactly, which takes memory proportional to the number of distinct patterns.
+
+    Returns:
+        trip_index (numpy.array): trip of each candidate word.
+        first_letter (numpy.array): index of the first letter of each candidate word in its trip's letter sequence.
+        The words are sorted by trip and first letter.
+    """
+    if sketch_width is None:
+        counter = HashCounter()
+    else:
+        counter = CountMinSketch(sketch_width)
+    for letter_seq in letter_seq_list:
+        counter.add(compute_word_hashes(letter_seq.letters, word_size))
+    trip_index_list = [np.zeros(0, dtype=np.int64)]
+    first_letter_list = [np.zeros(0, dtype=np.int64)]
+    for trip_index, letter_seq in enumerate(letter_seq_list):
+        word_hashes = compute_word_hashes(letter_seq.letters, word_size)
+        first_letter = np.flatnonzero(counter.get_counts(word_hashes) >= 2)
+        trip_index_list.append(np.full(len(first_letter), trip_index, dtype=np.int64))
+        first_letter_list.append(first_letter)
+    return np.concatenate(trip_index_list), np.concatenate(first_letter_list)
@@ -0,0 +1,145 @@
+import math
+import numpy as np
+
+
+class QuantileSketch(object):
+    """
+    Mergeable streaming sketch to estimate the percentiles of a (possibly huge) set of values without keeping them in
+    memory. The values are counted in logarithmic buckets, as in the DDSketch algorithm by Masson et all: the bucket i
+    holds the absolute values in (gamma^(i-1), gamma^i], with gamma = (1 + relative_accuracy) / (1 - relative_accuracy).
+    Thus, every estimated percentile is within relative_accuracy (in relative terms) of a value whose rank is the
+    requested one. Values with an absolute value below min_value are counted as zero. Two sketches with the same
+    parameters can be merged, which allows building them in parallel (e.g., per worker or per batch of trips).
+
+    Args:
+        relative_accuracy (float): relative error bound of the estimated percentiles. It must be in (0, 1).
+        min_value (float): absolute values smaller than this are counted as zero.
+
+    Attributes:
+        relative_accuracy (float): relative error bound of the estimated percentiles.
+        min_value (float): absolute values smaller than this are counted as zero.
+        count (int): number of values added to the sketch.
+        min (float): smallest value added to the sketch.
+        max (float): largest value added to the sketch.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        """
+        Constructor for the QuantileSketch class.
+
+        Args:
+            relative_accuracy (float): relative error bound of the estimated percentiles. It must be in (0, 1).
+            min_value (float): absolute values smaller than this are counted as zero.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("The relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive_counts = {}
+        self._negative_counts = {}
+        self._zero_count = 0
+
+    def add(self, values, chunk_size=1000000):
+        """
+        Adds a batch of values to the sketch. The values are processed in chunks, so the extra memory does not depend
+        on the size of the batch (e.g., a memory-mapped signal).
+
+        Args:
+            values (numpy.array): 1-dimensional array with the values to add.
+            chunk_size (int): number of values processed at a time.
+        """
+        for chunk_start in range(0, len(values), chunk_size):
+            chunk = np.asarray(
+                values[chunk_start : chunk_start + chunk_size], dtype=float
+            )
+            if len(chunk) == 0:
+                continue
+            self.count += len(chunk)
+            self.min = min(self.min, chunk.min())
+            self.max = max(self.max, chunk.max())
+            self._zero_count += int(np.sum(np.abs(chunk) <= self.min_value))
+            self._add_to_buckets(self._positive_counts, chunk[chunk > self.min_value])
+            self._add_to_buckets(self._negative_counts, -chunk[chunk < -self.min_value])
+
+    def _add_to_buckets(self, bucket_counts, abs_values):
+        if len(abs_values) == 0:
+            return
+        bucket_index = np.ceil(np.log(abs_values) / self._log_gamma).astype(np.int64)
+        unique_index, index_counts = np.unique(bucket_index, return_counts=True)
+        for index, index_count in zip(unique_index.tolist(), index_counts.tolist()):
+            bucket_counts[index] = bucket_counts.get(index, 0) + index_count
+
+    def merge(self, other_sketch):
+        """
+        Adds all the counts of other_sketch to this sketch.
+
+        Args:
+            other_sketch (tripMD.vsax.quantile_sketch.QuantileSketch): sketch built with the same parameters.
+        """
+        if (other_sketch.relative_accuracy != self.relative_accuracy) or (
+            other_sketch.min_value != self.min_value
+        ):
+            raise Exception(
+                "Only sketches with the same relative_accuracy and min_value can be merged"
+            )
+        self.count += other_sketch.count
+        self.min = min(self.min, other_sketch.min)
+        self.max = max(self.max, other_sketch.max)
+        self._zero_count += other_sketch._zero_count
+        for bucket_counts, other_counts in [
+            (self._positive_counts, other_sketch._positive_counts),
+            (self._negative_counts, other_sketch._negative_counts),
+        ]:
+            for index, index_count in other_counts.items():
+                bucket_counts[index] = bucket_counts.get(index, 0) + index_count
+
+    def get_percentile(self, percentile):
+        """
+        Args:
+            percentile (float or list of float): percentile(s) to estimate, between 0 and 100.
+
+        Returns:
+            value (float or numpy.array): estimated value(s) of the given percentile(s).
+        """
+        if self.count == 0:
+            raise Exception("The sketch is empty")
+        percentile_array = np.asarray(percentile, dtype=float)
+        bucket_values, bucket_counts = self._get_sorted_buckets()
+        cum_counts = np.cumsum(bucket_counts)
+        # rank of the value selected by numpy.percentile before the interpolation between neighbours
+        ranks = np.floor(percentile_array / 100.0 * (self.count - 1))
+        values = bucket_values[np.searchsorted(cum_counts, ranks, side="right")]
+        values = np.clip(values, self.min, self.max)
+        if values.ndim == 0:
+            return float(values)
+        return values
+
+    def _get_sorted_buckets(self):
+        negative_index = np.array(
+            sorted(self._negative_counts, reverse=True), dtype=np.int64
+        )
+        positive_index = np.array(sorted(self._positive_counts), dtype=np.int64)
+        bucket_values = np.concatenate(
+            (
+                -self._get_bucket_values(negative_index),
+                [0.0],
+                self._get_bucket_values(positive_index),
+            )
+        )
+        bucket_counts = np.concatenate(
+            (
+                [self._negative_counts[i] for i in negative_index.tolist()],
+                [self._zero_count],
+                [self._positive_counts[i] for i in positive_index.tolist()],
+            )
+        )
+        return bucket_values, bucket_counts
+
+    def _get_bucket_values(self, bucket_index):
+        # the middle point (in relative terms) of each bucket
+        return 2 * np.power(self._gamma, bucket_index.astype(float)) / (self._gamma + 1)
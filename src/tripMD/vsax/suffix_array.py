@@ -0,0 +1,146 @@
+import numpy as np
+
+
+def build_suffix_array(text):
+    """
+    This function builds the suffix array of a sequence of ints by prefix doubling: the suffixes are sorted by their
+    first 2^j symbols for j = 0, 1, 2, ... until all of them have a different rank. Each step is a single sort of
+    pairs of ranks, so it takes O(n log(n)) per step. The ranks of each step are also returned, since they allow
+    computing the longest common prefix of any two suffixes (see `build_lcp_array`). All the suffixes must be different,
+    which is guaranteed if the sequence ends with a symbol that appears nowhere else.
+
+    Args:
+        text (numpy.array): 1-dimensional array of int.
+
+    Returns:
+        suffix_array (numpy.array): starting position of each suffix of text, in lexicographic order.
+        rank_levels (list of numpy.array): list where the j-th array has the rank of the first 2^j symbols of each
+        suffix (equal prefixes have the same rank).
+    """
+    n = len(text)
+    rank = np.unique(text, return_inverse=True)[1].reshape(-1).astype(np.int64)
+    rank_levels = [rank]
+    suffix_array = np.argsort(rank, kind="stable")
+    prefix_size = 1
+    while len(rank) > 0 and rank.max() < n - 1:
+        # suffixes shorter than prefix_size come first, as in the lexicographic order
+        next_rank = np.full(n, -1, dtype=np.int64)
+        next_rank[: n - prefix_size] = rank[prefix_size:]
+        suffix_array = np.lexsort((next_rank, rank))
+        sorted_rank = rank[suffix_array]
+        sorted_next_rank = next_rank[suffix_array]
+        is_new_rank = np.concatenate(
+            (
+                [False],
+                (sorted_rank[1:] != sorted_rank[:-1])
+                | (sorted_next_rank[1:] != sorted_next_rank[:-1]),
+            )
+        )
+        rank = np.empty(n, dtype=np.int64)
+        rank[suffix_array] = np.cumsum(is_new_rank)
+        rank_levels.append(rank)
+        prefix_size = 2 * prefix_size
+    return suffix_array, rank_levels
+
+
+def build_lcp_array(suffix_array, rank_levels):
+    """
+    This function computes the length of the longest common prefix of each pair of consecutive suffixes in the suffix
+    array. The lengths of all pairs are computed at once by binary lifting over the ranks of each step of the prefix
+    doubling: two prefixes of size 2^j are equal if and only if they have the same rank in the j-th step.
+
+    Args:
+        suffix_array (numpy.array): suffix array computed with `build_suffix_array`.
+        rank_levels (list of numpy.array): ranks of each step, computed with `build_suffix_array`.
+
+    Returns:
+        lcp (numpy.array): array where lcp[i] is the length of the longest common prefix of the suffixes
+        suffix_array[i - 1] and suffix_array[i]. The first entry is 0.
+    """
+    n = len(suffix_array)
+    lcp = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return lcp
+    first_suffix = suffix_array[:-1]
+    second_suffix = suffix_array[1:]
+    pair_lcp = np.zeros(n - 1, dtype=np.int64)
+    for level in range(len(rank_levels) - 1, -1, -1):
+        prefix_size = 2**level
+        first_position = first_suffix + pair_lcp
+        second_position = second_suffix + pair_lcp
+        in_range = (first_position < n) & (second_position < n)
+        is_equal = np.zeros(n - 1, dtype=bool)
+        is_equal[in_range] = (
+            rank_levels[level][first_position[in_range]]
+            == rank_levels[level][second_position[in_range]]
+        )
+        pair_lcp[is_equal] += prefix_size
+    lcp[1:] = pair_lcp
+    return lcp
+
+
+class LetterSuffixArray(object):
+    """
+    Generalized suffix array (with the respective LCP array) of the letter sequences of all trips of a vsax sequence.
+    The integer letters of all trips are concatenated with a different separator after each trip, so that no common
+    prefix goes beyond the end of a trip. In the suffix array, all the occurrences of a pattern of size k are
+    consecutive and the consecutive suffixes with a common prefix of at least k letters are exactly the occurrences of
+    the patterns of size k that repeat. Thus, it enumerates the repeated patterns of every size from a single index,
+    and the longest repeated pattern is given by the maximum LCP.
+
+    Args:
+        letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of each trip.
+
+    Attributes:
+        text_offsets (numpy.array): position of the first letter of each trip in the concatenated sequence.
+        suffix_array (numpy.array): starting position of each suffix of the concatenated sequence, in lexicographic
+        order.
+        lcp (numpy.array): length of the longest common prefix of each suffix with the previous one in suffix_array.
+    """
+
+    def __init__(self, letter_seq_list):
+        """
+        Constructor for the LetterSuffixArray class.
+
+        Args:
+            letter_seq_list (list of tripMD.vsax.objects.vsax_letter_sequence.VSaxLetterSequence): letters of each
+            trip.
+        """
+        n_letters = np.array([len(seq) for seq in letter_seq_list], dtype=np.int64)
+        self.text_offsets = np.concatenate(([0], np.cumsum(n_letters + 1)))[:-1]
+        text_list = []
+        for trip_index, seq in enumerate(letter_seq_list):
+            # the letters are non-negative, so the separators are all different from them and from each other
+            text_list.append(seq.letters)
+            text_list.append([-trip_index - 1])
+        text = np.concatenate(text_list).astype(np.int64)
+        self.suffix_array, rank_levels = build_suffix_array(text)
+        self.lcp = build_lcp_array(self.suffix_array, rank_levels)
+
+    def get_max_repeat_size(self):
+        """
+        Returns:
+            max_repeat_size (int): number of letters of the longest pattern that appears more than once.
+        """
+        if len(self.lcp) == 0:
+            return 0
+        return int(self.lcp.max())
+
+    def get_repeated_words(self, word_size):
+        """
+        Args:
+            word_size (int): number of letters in each word.
+
+        Returns:
+            trip_index (numpy.array): trip of each word of size word_size whose pattern appears more than once.
+            first_letter (numpy.array): index of the first letter of each of those words in its trip's letter sequence.
+            The words are sorted by trip and first letter.
+        """
+        is_repeated_pair = self.lcp[1:] >= word_size
+        is_repeated = np.zeros(len(self.suffix_array), dtype=bool)
+        is_repeated[1:] |= is_repeated_pair
+        is_repeated[:-1] |= is_repeated_pair
+        positions = np.sort(self.suffix_array[is_repeated])
+        trip_index = np.searchsorted(self.text_offsets, positions, side="right") - 1
+        first_letter = positions - self.text_offsets[trip_index]
+        return trip_index, first_letter
@@ -1,31 +1,127 @@
 import os
+import json
+import shutil
+import hashlib
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
+UAH_SOURCE_FILES = [
+    "RAW_ACCELEROMETERS.txt",
+    "EVENTS_INERTIAL.txt",
+    "EVENTS_LIST_LANE_CHANGES.txt",
+]
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.expanduser("~"), ".cache", "tripMD")
+CACHE_VERSION = 1
 
-def get_full_point_uah_data(data_path, freq_per_second=10):
-    # initialize data variable as list
-    data_list = []
+
+def get_full_point_uah_data(data_path, freq_per_second=10, n_jobs=1):
+    # list the trip folders first, so that the output order does not depend on the number of workers
+    trip_folder_list = get_uah_trip_folders(data_path)
+    freq_list = [freq_per_second] * len(trip_folder_list)
+    if n_jobs == 1:
+        data_list = list(map(import_uah_trip, trip_folder_list, freq_list))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            data_list = list(executor.map(import_uah_trip, trip_folder_list, freq_list))
+    return pd.concat(data_list, ignore_index=True, sort=False)
+
+
+def get_cached_full_point_uah_data(
+    data_path, freq_per_second=10, cache_folder=DEFAULT_CACHE_FOLDER, n_jobs=1
+):
+    # the cache entry is identified by the data path and frequency and it is only valid while the fingerprint of the
+    # source files (paths, sizes and modification times) stays the same
+    abs_data_path = os.path.abspath(data_path)
+    fingerprint = compute_uah_data_fingerprint(abs_data_path, freq_per_second)
+    entry_name = hashlib.sha1(
+        "{}|{}".format(abs_data_path, freq_per_second).encode("utf-8")
+    ).hexdigest()[:16]
+    entry_folder = os.path.join(cache_folder, entry_name)
+    cached_df = load_cached_uah_data(entry_folder, fingerprint)
+    if cached_df is not None:
+        return cached_df
+    data_df = get_full_point_uah_data(abs_data_path, freq_per_second, n_jobs=n_jobs)
+    save_cached_uah_data(data_df, entry_folder, fingerprint)
+    return data_df
+
+
+def compute_uah_data_fingerprint(data_path, freq_per_second):
+    source_list = []
+    for root in get_uah_trip_folders(data_path):
+        for file_name in UAH_SOURCE_FILES:
+            file_path = os.path.join(root, file_name)
+            if os.path.exists(file_path):
+                file_stat = os.stat(file_path)
+                source_list.append(
+                    [
+                        os.path.relpath(file_path, data_path),
+                        file_stat.st_size,
+                        file_stat.st_mtime_ns,
+                    ]
+                )
+    fingerprint_dict = {
+        "version": CACHE_VERSION,
+        "freq_per_second": freq_per_second,
+        "sources": source_list,
+    }
+    fingerprint_str = json.dumps(fingerprint_dict, sort_keys=True)
+    return hashlib.sha256(fingerprint_str.encode("utf-8")).hexdigest()
+
+
+def load_cached_uah_data(entry_folder, fingerprint):
+    metadata_file = os.path.join(entry_folder, "metadata.json")
+    if not os.path.exists(metadata_file):
+        return None
+    with open(metadata_file, "r") as f:
+        metadata = json.load(f)
+    if metadata["fingerprint"] != fingerprint:
+        return None
+    data_dict = {}
+    for i, col_name in enumerate(metadata["columns"]):
+        col_file = os.path.join(entry_folder, "column_{}.npy".format(i))
+        data_dict[col_name] = np.load(col_file, allow_pickle=True)
+    return pd.DataFrame(data_dict, columns=metadata["columns"])
+
+
+def save_cached_uah_data(data_df, entry_folder, fingerprint):
+    # the entry is written to a temporary folder and then moved, so that an interrupted run never leaves a broken entry
+    tmp_folder = entry_folder + ".tmp"
+    shutil.rmtree(tmp_folder, ignore_errors=True)
+    os.makedirs(tmp_folder)
+    for i, col_name in enumerate(data_df.columns):
+        col_file = os.path.join(tmp_folder, "column_{}.npy".format(i))
+        np.save(col_file, data_df[col_name].to_numpy(), allow_pickle=True)
+    metadata = {"fingerprint": fingerprint, "columns": list(data_df.columns)}
+    with open(os.path.join(tmp_folder, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+    shutil.rmtree(entry_folder, ignore_errors=True)
+    os.rename(tmp_folder, entry_folder)
+
+
+def get_uah_trip_folders(data_path):
+    trip_folder_list = []
     for root, dirs, files in os.walk(data_path, topdown=False):
         if len(files) < 2:
             continue
         else:
-            # import individual trip files
-            inertial_df = import_uah_inertial(root)
-            events_df = import_uah_events(root)
-            lc_df = import_uah_lc(root)
-            # transform and join trip files
-            trip_df = transform_uah_trip_data(
-                inertial_df, events_df, lc_df, freq_per_second
-            )
-            # add ids and labels to trip_df
-            trip_df["user_id"] = root.split("/")[-1].split("-")[2]
-            trip_df["trip_id"] = root.split("/")[-1].split("-")[0]
-            trip_df["trip_label"] = get_trip_labels(root, len(trip_df.index))
-            trip_df["road"] = get_road_type(root)
-            # append trip to data_list
-            data_list.append(trip_df)
-    return pd.concat(data_list, ignore_index=True, sort=False)
+            trip_folder_list.append(root)
+    return trip_folder_list
+
+
+def import_uah_trip(root, freq_per_second):
+    # import individual trip files
+    inertial_df = import_uah_inertial(root)
+    events_df = import_uah_events(root)
+    lc_df = import_uah_lc(root)
+    # transform and join trip files
+    trip_df = transform_uah_trip_data(inertial_df, events_df, lc_df, freq_per_second)
+    # add ids and labels to trip_df
+    trip_df["user_id"] = root.split("/")[-1].split("-")[2]
+    trip_df["trip_id"] = root.split("/")[-1].split("-")[0]
+    trip_df["trip_label"] = get_trip_labels(root, len(trip_df.index))
+    trip_df["road"] = get_road_type(root)
+    return trip_df
 
 
 def import_uah_inertial(root_path):
@@ -74,22 +170,35 @@ def import_uah_lc(root_path):
         lc_df = pd.read_csv(file_path, sep=" ", header=None)
         # add the column names
         lc_df.columns = ["timestamp", "lc_event", "lat", "lon", "duration", "threshold"]
-        lc_len = len(lc_df.index)
-        for i in range(lc_len):
-            start = lc_df.loc[i]["timestamp"] + 0.1
-            end = lc_df.loc[i]["timestamp"] + lc_df.loc[i]["duration"] + 0.1
-            for time in np.arange(start, end, 0.1):
-                new_row = {
-                    "timestamp": time,
-                    "lc_event": lc_df.loc[i]["lc_event"],
-                }
-                lc_df = lc_df.append(new_row, ignore_index=True)
-        lc_df = lc_df[["timestamp", "lc_event"]]
+        lc_df = expand_uah_lc_events(lc_df)
     except:
         lc_df = pd.DataFrame(columns=["timestamp", "lc_event"])
     return lc_df
 
 
+def expand_uah_lc_events(lc_df, step=0.1):
+    # each lane change is expanded into one row every `step` seconds during its duration, i.e., with the same values
+    # as np.arange(start, end, step) for each event, but computed for all events at once
+    start = lc_df["timestamp"].to_numpy() + step
+    end = lc_df["timestamp"].to_numpy() + lc_df["duration"].to_numpy() + step
+    n_points = np.maximum(np.ceil((end - start) / step), 0).astype(int)
+    # np.arange computes its values as start + i * (second value - start)
+    arange_step = (start + step) - start
+    event_index = np.repeat(np.arange(len(lc_df.index)), n_points)
+    point_index = np.arange(n_points.sum()) - np.repeat(
+        np.cumsum(n_points) - n_points, n_points
+    )
+    expanded_lc_df = pd.DataFrame(
+        {
+            "timestamp": start[event_index] + point_index * arange_step[event_index],
+            "lc_event": lc_df["lc_event"].to_numpy()[event_index],
+        }
+    )
+    return pd.concat(
+        [lc_df[["timestamp", "lc_event"]], expanded_lc_df], ignore_index=True
+    )
+
+
 def transform_uah_trip_data(inertial_df, events_df, lc_df, freq_per_second):
     trans_inertial_df = (
         inertial_df.drop(